@@ -0,0 +1,198 @@
+"""
+Employee Contact API 벤치마크
+
+generate_fake_employees와 같은 어휘로 1k/10k/100k/1M명 규모의 가짜 직원 디렉토리를 만들고,
+Flask 테스트 클라이언트로 /api/contacts에 실제와 비슷한 필터/정렬/페이지 조합을 요청해
+지연 시간(p50/p95/p99), 처리량, 최대 메모리를 JSON으로 출력합니다.
+
+사용 예:
+   python benchmark_contacts.py
+   python benchmark_contacts.py --sizes 1000,10000 --requests 500 --output bench.json
+   python benchmark_contacts.py --sizes 100000 --with-cache
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import contact_service
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+# 시나리오별 가중치 (디렉토리 페이지 실제 호출 비율을 흉내냄)
+SCENARIO_WEIGHTS = {
+    'first_page': 25,
+    'department': 20,
+    'name_prefix': 15,
+    'multi_filter': 10,
+    'sorted_deep_page': 10,
+    'keyset_next': 10,
+    'choseong': 5,
+    'fuzzy': 5,
+}
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    """지연 시간 목록(초) → 요약 통계 (ms)"""
+    values = sorted(latencies)
+    return {
+        'requests': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3),
+        'throughput_rps': round(len(values) / elapsed, 1) if elapsed else None
+    }
+
+
+class QueryMix:
+    """디렉토리 어휘에서 시나리오별 요청 파라미터 생성"""
+
+    def __init__(self, directory, rng):
+        self.rng = rng
+        index = directory.index
+        self.size = index.size
+        self.departments = list(index.value_bits['department_name'])
+        self.companies = list(index.value_bits['company_name'])
+        self.locations = list(index.value_bits['location'])
+        self.positions = list(index.value_bits['position'])
+        self.names = index.name_values
+        self.scenarios = list(SCENARIO_WEIGHTS)
+        self.weights = [SCENARIO_WEIGHTS[name] for name in self.scenarios]
+        self.cursor = None  # keyset_next 시나리오가 이어서 넘길 커서
+
+    def pick(self):
+        return self.rng.choices(self.scenarios, self.weights)[0]
+
+    def params(self, scenario):
+        rng = self.rng
+        sort_by = rng.choice(contact_service.SORT_FIELDS)
+        sort_order = rng.choice(('asc', 'desc'))
+        if scenario == 'first_page':
+            return {'page': 1, 'limit': 20}
+        if scenario == 'department':
+            return {'departmentname': rng.choice(self.departments), 'page': rng.randint(1, 3), 'limit': 20,
+                    'sort_by': sort_by, 'sort_order': sort_order}
+        if scenario == 'name_prefix':
+            return {'fullname': rng.choice(self.names)[:rng.randint(1, 2)], 'limit': 20}
+        if scenario == 'multi_filter':
+            return {'departmentname': rng.choice(self.departments), 'companyname': rng.choice(self.companies),
+                    'location': rng.choice(self.locations), 'position': rng.choice(self.positions),
+                    'limit': 20, 'sort_by': sort_by, 'sort_order': sort_order, 'facets': 'all'}
+        if scenario == 'sorted_deep_page':
+            pages = max(1, self.size // 20)
+            return {'page': rng.randint(1, pages), 'limit': 20, 'sort_by': sort_by, 'sort_order': sort_order}
+        if scenario == 'choseong':
+            return {'fullname': contact_service.to_choseong(rng.choice(self.names)), 'limit': 20}
+        if scenario == 'fuzzy':
+            return {'fullname': rng.choice(self.names), 'search_mode': 'fuzzy', 'limit': 20}
+        if scenario == 'keyset_next':
+            return {'limit': 20, 'after': self.cursor} if self.cursor else {'limit': 20}
+        raise ValueError(scenario)
+
+
+def run_size(size, request_count, seed, with_cache):
+    """디렉토리 한 규모에 대한 벤치마크"""
+    rng = random.Random(seed)
+    random.seed(seed)
+
+    # 1) 적재: 저장소 + 인덱스 생성 시간과 최대 메모리
+    tracemalloc.start()
+    started = time.perf_counter()
+    directory = contact_service.ContactDirectory(contact_service.iter_fake_employees(size), version=size)
+    build_seconds = time.perf_counter() - started
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    contact_service.directory = directory
+    contact_service.contacts_cache = contact_service.ResponseCache(max_entries=512 if with_cache else 0)
+    client = contact_service.app.test_client()
+    mix = QueryMix(directory, rng)
+
+    # 2) 워밍업
+    for _ in range(min(50, request_count)):
+        client.get('/api/contacts', query_string=mix.params(mix.pick()))
+
+    # 3) 측정
+    latencies = []
+    by_scenario = {name: [] for name in mix.scenarios}
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(request_count):
+        scenario = mix.pick()
+        params = mix.params(scenario)
+
+        request_started = time.perf_counter()
+        response = client.get('/api/contacts', query_string=params)
+        latency = time.perf_counter() - request_started
+
+        if response.status_code != 200:
+            errors += 1
+        elif scenario == 'keyset_next':
+            mix.cursor = response.get_json()['pagination'].get('next_after')
+        latencies.append(latency)
+        by_scenario[scenario].append(latency)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'size': size,
+        'build': {
+            'seconds': round(build_seconds, 3),
+            'peak_traced_bytes': build_peak,
+            'store': directory.store.memory_footprint()['total_bytes']
+        },
+        'latency': summarize(latencies, elapsed),
+        'scenarios': {name: summarize(values, sum(values)) for name, values in by_scenario.items() if values},
+        'errors': errors,
+        'response_cache': contact_service.contacts_cache.stats()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Employee Contact API /api/contacts 벤치마크')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='쉼표로 구분한 디렉토리 규모 (기본: 1000,10000,100000,1000000)')
+    parser.add_argument('--requests', type=int, default=1000, help='규모별 측정 요청 수')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    parser.add_argument('--with-cache', action='store_true', help='응답 캐시를 켠 상태로 측정')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    for size in sizes:
+        print(f"⏱️  {size}명 디렉토리 측정 중...", file=sys.stderr)
+        results.append(run_size(size, args.requests, args.seed, args.with_cache))
+
+    report = {
+        'benchmark': 'employee-api /api/contacts',
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'requests_per_size': args.requests,
+        'with_cache': args.with_cache,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,22 @@
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, send_file
 from flask_cors import CORS
 import random
 import os
 import requests
 import json
+import base64
+import csv
+import hashlib
+import heapq
+import html
+import io
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from itertools import compress
 from datetime import datetime, timedelta
 
 app = Flask(__name__)
@@ -42,8 +55,8 @@ def load_config_from_db():
         exit(1)
 
 # 가짜 직원 데이터 생성 함수
-def generate_fake_employees():
-    """랜덤한 한국 직원 데이터 50명 생성"""
+def iter_fake_employees(count=50):
+    """랜덤한 한국 직원 데이터 count명을 하나씩 생성 (대량 생성 시 목록을 만들지 않음)"""
     departments = ['개발팀', '마케팅팀', '영업팀', '인사팀', '재무팀', '디자인팀', '기획팀', '운영팀']
     companies = ['내부전자', '내부SDS', '내부디스플레이', '내부바이오로직스', '내부물산']
     first_names = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임']
@@ -61,9 +74,7 @@ def generate_fake_employees():
         '품질 관리 전문가', '프로젝트 매니저', '비즈니스 분석가'
     ]
 
-    employees = []
-    
-    for i in range(1, 51):
+    for i in range(1, count + 1):
         first_name = random.choice(first_names)
         last_name = random.choice(last_names)
         full_name = first_name + last_name
@@ -98,101 +109,1114 @@ def generate_fake_employees():
             'avatar_url': f'/api/avatar/{i}'
         }
         
-        employees.append(employee)
-    
-    return employees
+        yield employee
+
+def generate_fake_employees(count=50):
+    """랜덤한 한국 직원 데이터 생성 (기본 50명)"""
+    return list(iter_fake_employees(count))
+
+# --- 컬럼형 직원 저장소 ---
+
+# 직원 레코드 컬럼 (응답 dict 키 순서와 동일)
+EMPLOYEE_COLUMNS = (
+    'id', 'employee_number', 'full_name', 'email_address', 'phone_number', 'extension',
+    'company_name', 'department_name', 'position', 'location', 'description',
+    'join_date', 'updated_at', 'status', 'avatar_url'
+)
+# 값 종류가 적어 사전 인코딩(값 → 정수 코드)하는 컬럼
+ENCODED_COLUMNS = ('company_name', 'department_name', 'position', 'location', 'description', 'status')
+# 행마다 문자열을 그대로 보관하는 컬럼
+TEXT_COLUMNS = ('employee_number', 'full_name', 'email_address', 'phone_number', 'extension', 'join_date', 'updated_at')
+# avatar_url은 id로부터 만들 수 있으므로 패턴과 다른 경우만 저장
+AVATAR_URL_PATTERN = '/api/avatar/{}'
+
+
+class EmployeeStore:
+    """
+    직원 디렉토리 컬럼형 저장소.
+
+    - id: array('q')
+    - 저카디널리티 컬럼: 값 사전(vocab) + array('H') 코드 (값이 65536개를 넘으면 array('I'))
+    - 그 외 문자열 컬럼: 컬럼별 list
+    응답 dict는 반환할 페이지의 행에 대해서만 row()로 만들어집니다.
+    """
+
+    __slots__ = ('ids', 'text', 'codes', 'vocab', 'avatar_overrides', '_footprint', '_row_by_id')
+
+    def __init__(self, records):
+        self.ids = array('q')
+        self.text = {column: [] for column in TEXT_COLUMNS}
+        self.codes = {column: array('H') for column in ENCODED_COLUMNS}
+        self.vocab = {column: [] for column in ENCODED_COLUMNS}
+        self.avatar_overrides = {}
+        self._footprint = None
+        self._row_by_id = None
+        lookup = {column: {} for column in ENCODED_COLUMNS}
+
+        for row, record in enumerate(records):
+            emp_id = int(record['id'])
+            self.ids.append(emp_id)
+            for column in TEXT_COLUMNS:
+                self.text[column].append(record.get(column))
+            for column in ENCODED_COLUMNS:
+                value = record.get(column)
+                code = lookup[column].get(value)
+                if code is None:
+                    code = len(self.vocab[column])
+                    if code == 1 << 16 and self.codes[column].typecode == 'H':
+                        self.codes[column] = array('I', self.codes[column])
+                    self.vocab[column].append(value)
+                    lookup[column][value] = code
+                self.codes[column].append(code)
+            avatar_url = record.get('avatar_url')
+            if avatar_url != AVATAR_URL_PATTERN.format(emp_id):
+                self.avatar_overrides[row] = avatar_url
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row_of(self, emp_id):
+        """직원 id → 행 번호 (없으면 None, 조회용 dict는 처음 호출 시 생성)"""
+        if self._row_by_id is None:
+            self._row_by_id = {value: row for row, value in enumerate(self.ids)}
+        return self._row_by_id.get(emp_id)
+
+    def value(self, column, row):
+        """단일 셀 값"""
+        if column in self.text:
+            return self.text[column][row]
+        if column in self.codes:
+            return self.vocab[column][self.codes[column][row]]
+        if column == 'id':
+            return self.ids[row]
+        if column == 'avatar_url':
+            if row in self.avatar_overrides:
+                return self.avatar_overrides[row]
+            return AVATAR_URL_PATTERN.format(self.ids[row])
+        raise KeyError(column)
+
+    def column(self, column):
+        """컬럼 전체 값 목록 (인덱스 생성용)"""
+        if column in self.text:
+            return self.text[column]
+        if column in self.codes:
+            vocab = self.vocab[column]
+            return [vocab[code] for code in self.codes[column]]
+        return [self.value(column, row) for row in range(len(self))]
+
+    def row(self, row):
+        """행 하나를 응답용 dict로 변환"""
+        return {column: self.value(column, row) for column in EMPLOYEE_COLUMNS}
+
+    def rows(self, rows):
+        """행 번호 목록을 응답용 dict 목록으로 변환"""
+        return [self.row(row) for row in rows]
+
+    def fingerprint(self):
+        """저장소 내용 해시 (같은 데이터를 적재한 프로세스끼리는 항상 같은 값)"""
+        digest = hashlib.sha1(self.ids.tobytes())
+        for column in TEXT_COLUMNS:
+            digest.update(json.dumps(self.text[column], ensure_ascii=False, default=str).encode('utf-8'))
+        for column in ENCODED_COLUMNS:
+            digest.update(json.dumps(self.vocab[column], ensure_ascii=False, default=str).encode('utf-8'))
+            digest.update(self.codes[column].tobytes())
+        digest.update(json.dumps(sorted(self.avatar_overrides.items()), default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def memory_footprint(self):
+        """저장소가 차지하는 메모리(바이트) 추정치 - 같은 문자열 객체는 한 번만 계산"""
+        if self._footprint is None:
+            seen = set()
+
+            def sizeof(obj):
+                if obj is None or id(obj) in seen:
+                    return 0
+                seen.add(id(obj))
+                return sys.getsizeof(obj)
+
+            columns = {'id': sys.getsizeof(self.ids)}
+            for column, values in self.text.items():
+                columns[column] = sys.getsizeof(values) + sum(sizeof(value) for value in values)
+            for column, codes in self.codes.items():
+                columns[column] = sys.getsizeof(codes) + sys.getsizeof(self.vocab[column]) + \
+                    sum(sizeof(value) for value in self.vocab[column])
+            columns['avatar_url'] = sys.getsizeof(self.avatar_overrides) + \
+                sum(sizeof(value) for value in self.avatar_overrides.values())
+
+            total = sum(columns.values())
+            self._footprint = {
+                'rows': len(self),
+                'total_bytes': total,
+                'bytes_per_row': round(total / len(self), 1) if len(self) else 0,
+                'columns': columns,
+                'encoded_columns': {column: len(self.vocab[column]) for column in ENCODED_COLUMNS}
+            }
+        return self._footprint
+
+
+# --- 검색 인덱스 ---
+
+# 요청 파라미터 → 직원 데이터 컬럼 매핑
+FILTER_PARAMS = {
+    'fullname': 'full_name',
+    'emailaddress': 'email_address',
+    'departmentname': 'department_name',
+    'companyname': 'company_name',
+    'position': 'position',
+    'location': 'location',
+}
+# 부분 검색용 n-gram 포스팅을 만드는 컬럼 (값 종류가 많음)
+NGRAM_FIELDS = ('full_name', 'email_address')
+# 값별 비트셋을 만드는 컬럼 (값 종류가 적음)
+VALUE_FIELDS = ('department_name', 'company_name', 'position', 'location')
+# 정렬 순서(순열)를 미리 계산해 두는 컬럼
+SORT_FIELDS = ('full_name', 'department_name', 'company_name', 'position', 'location')
+
+
+def rows_to_bitset(rows, size):
+    """행 번호 목록을 비트셋(int)으로 변환"""
+    buf = bytearray((size + 7) // 8)
+    for row in rows:
+        buf[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buf, 'little')
+
+# '0'/'1' 문자 → 0/1 바이트 변환 테이블
+_BIT_TABLE = bytes.maketrans(b'01', b'\x00\x01')
+
+def bitset_to_rows(mask):
+    """비트셋(int)에 포함된 행 번호를 오름차순으로 반환"""
+    bits = bin(mask)[:1:-1].encode('ascii').translate(_BIT_TABLE)  # '0b' 제거 후 하위 비트부터
+    return list(compress(range(len(bits)), bits))
+
+def build_postings(grouped, size):
+    """
+    n-gram → 행 목록을 포스팅으로 변환.
+    드문 gram은 정렬된 행 번호 배열(array('I'))로, 전체의 1/64 이상 행에 나오는 gram만 비트셋(int)으로 저장
+    (gram마다 N비트 비트셋을 두면 메모리가 gram 수 × N으로 커짐)
+    """
+    dense_min = max(1, size // 64)
+    return {gram: rows_to_bitset(rows, size) if len(rows) >= dense_min else array('I', rows)
+            for gram, rows in grouped.items()}
+
+def posting_mask(posting, size):
+    """포스팅(비트셋 또는 행 번호 배열) → 비트셋 (없으면 0)"""
+    if posting is None:
+        return 0
+    if isinstance(posting, int):
+        return posting
+    return rows_to_bitset(posting, size)
+
+def bitset_count(mask):
+    """비트셋에 포함된 행 수"""
+    return bin(mask).count('1')
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    bitset_count = int.bit_count
+
+def _text_grams(text):
+    """인덱싱용 1-gram + 2-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def _query_grams(query):
+    """검색어를 덮는 최소 n-gram 목록 (1글자면 1-gram, 아니면 2-gram)"""
+    if len(query) == 1:
+        return [query]
+    return [query[i:i + 2] for i in range(len(query) - 1)]
+
+
+# --- 한글 검색 (초성 / 자모 분해) ---
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+CHOSEONG_SET = frozenset(CHOSEONG)
+
+# 이름 검색 방식: auto(초성 포함 시 초성 검색), choseong, fuzzy(오타 허용), substring(기존 방식)
+NAME_SEARCH_MODES = ('auto', 'choseong', 'fuzzy', 'substring')
+
+
+def to_choseong(text):
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로) - 예: '김민준' → 'ㄱㅁㅈ'"""
+    chars = []
+    for ch in text:
+        code = ord(ch) - HANGUL_BASE
+        chars.append(CHOSEONG[code // 588] if 0 <= code <= HANGUL_LAST - HANGUL_BASE else ch)
+    return ''.join(chars)
+
+def to_jamo(text):
+    """한글 음절을 초성/중성/종성 자모로 분해 - 예: '김' → 'ㄱㅣㅁ'"""
+    chars = []
+    for ch in text:
+        code = ord(ch) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            chars.append(CHOSEONG[code // 588] + JUNGSEONG[(code % 588) // 28] + JONGSEONG[code % 28])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+def has_choseong(text):
+    """검색어에 초성(자음 자모)이 포함되어 있는지"""
+    return any(ch in CHOSEONG_SET for ch in text)
+
+def choseong_match(query, text):
+    """초성 혼합 부분 일치 - 검색어의 자음 자모는 해당 위치 음절의 초성과 비교"""
+    for start in range(len(text) - len(query) + 1):
+        for offset, qch in enumerate(query):
+            ch = text[start + offset]
+            if qch != ch and not (qch in CHOSEONG_SET and to_choseong(ch) == qch):
+                break
+        else:
+            return True
+    return False
+
+def _trigrams(text):
+    """오타 검색용 trigram 목록 (앞 2칸, 뒤 1칸 패딩)"""
+    padded = '\0\0' + text + '\0'
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def bounded_edit_distance(a, b, limit):
+    """편집 거리가 limit 이하이면 그 값을, 초과하면 limit + 1을 반환"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+def default_fuzzy_distance(query):
+    """자모 길이에 따른 기본 허용 편집 거리 (세 글자 한글 이름까지 1, 그보다 길면 2)"""
+    return 1 if len(to_jamo(query)) <= 9 else 2
+
+
+class ContactSearchIndex:
+    """
+    직원 저장소에 대한 메모리 검색 인덱스 (데이터 로드 시 한 번만 생성).
+
+    - 이름/이메일: 소문자 변환 값 + 1/2-gram 포스팅 (드문 gram은 행 번호 배열, 흔한 gram은 비트셋)
+    - 부서/회사/직위/근무지: 값별 행 비트셋
+    비트셋은 행 번호를 비트 위치로 쓰는 int이며, 다중 필터는 비트 AND로 교집합을 구합니다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.size = len(store)
+        self.all_rows = (1 << self.size) - 1
+        self.lowered = {}
+        self.postings = {}
+        self.value_bits = {}
+        self.value_lowered = {}
+
+        for field in NGRAM_FIELDS:
+            column = []
+            grouped = {}
+            for row, text in enumerate(store.column(field)):
+                text = str(text or '')
+                lowered = text.lower()
+                column.append(text if lowered == text else lowered)
+                for gram in _text_grams(lowered):
+                    grouped.setdefault(gram, []).append(row)
+            self.lowered[field] = column
+            self.postings[field] = build_postings(grouped, self.size)
+
+        for field in VALUE_FIELDS:
+            # 사전 인코딩 코드별로 행을 모아 값 비트셋 생성
+            grouped = [[] for _ in store.vocab[field]]
+            for row, code in enumerate(store.codes[field]):
+                grouped[code].append(row)
+            bits = {}
+            for value, rows in zip(store.vocab[field], grouped):
+                value = str(value or '')
+                bits[value] = bits.get(value, 0) | rows_to_bitset(rows, self.size)
+            self.value_bits[field] = bits
+            self.value_lowered[field] = {value: value.lower() for value in bits}
+
+        # 이름 한글 검색: 초성 문자열 1/2-gram 포스팅 + 서로 다른 이름별 자모 trigram
+        self.choseong = []
+        grouped = {}
+        name_rows = {}
+        for row, name in enumerate(self.lowered['full_name']):
+            choseong = to_choseong(name)
+            self.choseong.append(name if choseong == name else choseong)
+            for gram in _text_grams(choseong):
+                grouped.setdefault(gram, []).append(row)
+            name_rows.setdefault(name, []).append(row)
+        self.choseong_postings = build_postings(grouped, self.size)
+        self.name_values = list(name_rows)
+        # 이름 id → 행 번호 배열 (실제 디렉토리는 이름이 대부분 서로 달라 이름별 N비트 비트셋은 메모리 낭비)
+        self.name_rows = [array('I', rows) for rows in name_rows.values()]
+        self.name_jamo = [to_jamo(name) for name in self.name_values]
+        grouped = {}
+        for name_id, jamo in enumerate(self.name_jamo):
+            for gram in set(_trigrams(jamo)):
+                grouped.setdefault(gram, []).append(name_id)
+        self.jamo_trigrams = {gram: array('I', ids) for gram, ids in grouped.items()}
+
+        # 정렬 뷰: 컬럼별 (값, id) 오름차순 순열과 행 → 순위 배열
+        ids = store.ids
+        self.sort_orders = {}
+        self.sort_ranks = {}
+        for field in SORT_FIELDS:
+            values = [str(value or '') for value in store.column(field)]
+            order = sorted(range(self.size), key=lambda row: (values[row], ids[row]))
+            rank = array('I', bytes(4 * self.size))
+            for pos, row in enumerate(order):
+                rank[row] = pos
+            self.sort_orders[field] = array('I', order)
+            self.sort_ranks[field] = rank
+
+    def _ngram_candidates(self, field, query):
+        """n-gram 포스팅 교집합 (2글자 이하 검색어는 정확한 결과, 그 이상은 후보 집합)"""
+        postings = self.postings[field]
+        mask = self.all_rows
+        for gram in _query_grams(query):
+            mask &= posting_mask(postings.get(gram), self.size)
+            if not mask:
+                break
+        return mask
+
+    def _value_match(self, field, query):
+        """검색어를 포함하는 값들의 비트셋 합집합"""
+        mask = 0
+        lowered = self.value_lowered[field]
+        for value, bits in self.value_bits[field].items():
+            if query in lowered[value]:
+                mask |= bits
+        return mask
+
+    def _choseong_search(self, query):
+        """초성(또는 초성 혼합) 이름 검색 - 예: 'ㄱㅁㅈ', '김ㅁ'"""
+        mask = self.all_rows
+        for gram in _query_grams(to_choseong(query)):
+            mask &= posting_mask(self.choseong_postings.get(gram), self.size)
+            if not mask:
+                return 0
+        # 순수 초성 2글자 이하는 포스팅 교집합이 곧 결과, 그 외는 후보만 검사
+        if all(ch in CHOSEONG_SET for ch in query):
+            if len(query) > 2:
+                column = self.choseong
+                mask = rows_to_bitset([row for row in bitset_to_rows(mask) if query in column[row]], self.size)
+        else:
+            names = self.lowered['full_name']
+            mask = rows_to_bitset([row for row in bitset_to_rows(mask) if choseong_match(query, names[row])], self.size)
+        return mask
+
+    def _fuzzy_search(self, query, max_distance):
+        """오타 허용 이름 검색 - 자모 trigram으로 후보 이름을 줄인 뒤 편집 거리 검증"""
+        jamo = to_jamo(query)
+        grams = _trigrams(jamo)
+        # 편집 1회는 trigram을 최대 3개 깨뜨리므로 최소 공유 개수 미만인 이름은 제외
+        threshold = len(grams) - 3 * max_distance
+        if threshold > 0:
+            shared = {}
+            for gram in set(grams):
+                for name_id in self.jamo_trigrams.get(gram, ()):
+                    shared[name_id] = shared.get(name_id, 0) + 1
+            candidates = [name_id for name_id, count in shared.items() if count >= threshold]
+        else:
+            candidates = range(len(self.name_values))
+
+        rows = []
+        for name_id in candidates:
+            if bounded_edit_distance(jamo, self.name_jamo[name_id], max_distance) <= max_distance:
+                rows.extend(self.name_rows[name_id])
+        return rows_to_bitset(rows, self.size)
+
+    def _name_search(self, query, name_mode, fuzzy_distance):
+        """이름 검색 방식별 행 비트셋"""
+        if name_mode == 'fuzzy':
+            distance = default_fuzzy_distance(query) if fuzzy_distance is None else fuzzy_distance
+            exact = self.search({'full_name': query}, name_mode='auto')
+            return exact | self._fuzzy_search(query, distance)
+        if name_mode == 'choseong' or has_choseong(query):
+            return self._choseong_search(query)
+        return None
+
+    def search(self, filters, name_mode='auto', fuzzy_distance=None):
+        """
+        필터 조건(컬럼 → 검색어)에 맞는 행 비트셋을 반환.
+        기존 API와 동일하게 대소문자 무시 부분 문자열 일치로 동작하며,
+        이름은 name_mode에 따라 초성/오타 허용 검색을 함께 지원합니다.
+        """
+        mask = self.all_rows
+        to_verify = []
+        for field, query in filters.items():
+            if not query:
+                continue
+            query = query.lower()
+            name_mask = None
+            if field == 'full_name' and name_mode != 'substring':
+                name_mask = self._name_search(query, name_mode, fuzzy_distance)
+            if name_mask is not None:
+                mask &= name_mask
+            elif field in self.postings:
+                mask &= self._ngram_candidates(field, query)
+                if len(query) > 2:
+                    to_verify.append((field, query))
+            else:
+                mask &= self._value_match(field, query)
+            if not mask:
+                return 0
+
+        # 3글자 이상 검색어는 교집합으로 줄어든 후보만 실제 부분 문자열 검사
+        if to_verify:
+            rows = bitset_to_rows(mask)
+            for field, query in to_verify:
+                column = self.lowered[field]
+                rows = [row for row in rows if query in column[row]]
+            mask = rows_to_bitset(rows, self.size)
+        return mask
+
+    def facets(self, filters, fields=VALUE_FIELDS, **search_options):
+        """
+        컬럼별 값 개수 (드릴 사이드웨이 방식).
+        각 컬럼의 개수는 그 컬럼 자신의 필터만 뺀 나머지 필터 결과 기준이므로
+        드롭다운에서 다른 값으로 바꿨을 때의 결과 수를 그대로 보여줄 수 있습니다.
+        """
+        masks = {field: self.search({field: query}, **search_options) for field, query in filters.items() if query}
+        result = {}
+        for field in fields:
+            base = self.all_rows
+            for other, mask in masks.items():
+                if other != field:
+                    base &= mask
+            counts = []
+            for value, bits in self.value_bits[field].items():
+                count = bitset_count(base & bits)
+                if count:
+                    counts.append({'value': value, 'count': count})
+            counts.sort(key=lambda item: (-item['count'], item['value']))
+            result[field] = counts
+        return result
+
+    def sort_key(self, field, row):
+        """키셋 페이지네이션 커서에 쓰는 (정렬 값, id)"""
+        return str(self.store.value(field, row) or ''), self.store.ids[row]
+
+    def _walk(self, order, start, step, mask, skip, limit, budget=None):
+        """
+        정렬 순열을 start부터 따라가며 mask에 포함된 행을 skip개 건너뛰고 limit개 수집.
+        budget만큼 훑어도 다 채우지 못하면 None (결과가 순열 한쪽에 몰린 경우)
+        """
+        if mask == self.all_rows:
+            # 필터가 없으면 순열을 바로 잘라냄 - O(limit)
+            start += skip * step
+            stop = start + limit * step
+            if step > 0:
+                return list(order[max(start, 0):max(stop, 0)])
+            if start < 0:
+                return []
+            return list(order[start:stop if stop >= 0 else None:-1])
+
+        member = bin(mask)[:1:-1]
+        member_len = len(member)
+        rows = []
+        pos = start
+        stop = self.size if budget is None else budget
+        while 0 <= pos < self.size and len(rows) < limit:
+            if not stop:
+                return None
+            stop -= 1
+            row = order[pos]
+            pos += step
+            if row < member_len and member[row] == '1':
+                if skip:
+                    skip -= 1
+                else:
+                    rows.append(row)
+        return rows
+
+    def iter_rows(self, mask, sort_by, descending, batch_size=1000):
+        """정렬 순서대로 mask에 포함된 행 번호를 batch_size개씩 생성 (전체 목록을 만들지 않음)"""
+        if sort_by not in self.sort_orders:
+            rows = bitset_to_rows(mask)
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+            return
+        cursor = None
+        while True:
+            if cursor is None:
+                rows = self.page(mask, sort_by, descending, 0, batch_size)
+            else:
+                rows = self.page_after(mask, sort_by, descending, cursor, batch_size)
+            if not rows:
+                return
+            yield rows
+            cursor = self.sort_key(sort_by, rows[-1])
+
+    def page(self, mask, sort_by, descending, offset, limit):
+        """offset/limit 방식 페이지 (정렬 순열 기반)"""
+        if sort_by not in self.sort_orders:
+            # 정렬 대상이 아니면 기존처럼 원래 순서 유지
+            return bitset_to_rows(mask)[offset:offset + limit]
+
+        order = self.sort_orders[sort_by]
+        start, step = (self.size - 1, -1) if descending else (0, 1)
+        if mask == self.all_rows:
+            return self._walk(order, start, step, mask, offset, limit)
+
+        # 결과가 순열 전체에 고르게 퍼져 있으면 순열을 훑는 편이 빠르고,
+        # 희소하거나 한쪽에 몰려 있으면(예: 부서 필터 + 부서 정렬) 후보만 순위로 골라냄
+        count = bitset_count(mask)
+        expected = (offset + limit) * self.size // max(count, 1)  # 고르게 퍼져 있을 때 훑을 길이
+        rows = None
+        if expected <= count:
+            rows = self._walk(order, start, step, mask, offset, limit, budget=4 * expected + 64)
+        if rows is None:
+            rows = self._top_by_rank(bitset_to_rows(mask), sort_by, descending, offset + limit)[offset:]
+        return rows
+
+    def _top_by_rank(self, rows, sort_by, descending, n):
+        """후보 행 중 정렬 순서상 앞쪽 n개"""
+        order = self.sort_orders[sort_by]
+        if n < len(rows) // 8:
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            positions = pick(n, map(self.sort_ranks[sort_by].__getitem__, rows))
+        else:
+            positions = sorted(map(self.sort_ranks[sort_by].__getitem__, rows), reverse=descending)[:n]
+        return [order[pos] for pos in positions]
+
+    def page_after(self, mask, sort_by, descending, cursor, limit):
+        """키셋 방식 페이지: cursor (정렬 값, id) 다음 행부터 limit개 - O(log N + limit)"""
+        order = self.sort_orders[sort_by]
+        key = lambda pos: self.sort_key(sort_by, order[pos])
+        cursor = tuple(cursor)
+
+        # 순열에서 cursor 위치를 이진 탐색
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (key(mid) <= cursor) if not descending else (key(mid) < cursor):
+                lo = mid + 1
+            else:
+                hi = mid
+        start, step = (lo - 1, -1) if descending else (lo, 1)
+        if mask == self.all_rows:
+            return self._walk(order, start, step, mask, 0, limit)
+
+        count = bitset_count(mask)
+        rows = self._walk(order, start, step, mask, 0, limit, budget=4 * limit * self.size // max(count, 1) + 64)
+        if rows is None:
+            # cursor 이후 순위의 후보만 골라 정렬
+            rank = self.sort_ranks[sort_by]
+            if descending:
+                candidates = [row for row in bitset_to_rows(mask) if rank[row] < lo]
+            else:
+                candidates = [row for row in bitset_to_rows(mask) if rank[row] >= lo]
+            rows = self._top_by_rank(candidates, sort_by, descending, limit)
+        return rows
+
+
+# 값별 개수(facet)를 제공하는 필터 파라미터
+FACET_PARAMS = ('departmentname', 'companyname', 'position', 'location')
+
+
+def read_facet_params(value):
+    """facets 파라미터 해석: 'all'/'true'면 전체, 아니면 쉼표로 구분된 파라미터명"""
+    value = value.strip().lower()
+    if not value:
+        return []
+    if value in ('all', 'true', '1'):
+        return list(FACET_PARAMS)
+    return [param for param in FACET_PARAMS if param in value.split(',')]
+
+def build_facets(index, filters, facet_params, search_options):
+    """facet 결과를 필터 파라미터명 기준으로 구성"""
+    counts = index.facets(to_index_filters(filters), [FILTER_PARAMS[param] for param in facet_params], **search_options)
+    return {param: counts[FILTER_PARAMS[param]] for param in facet_params}
+
+def read_contact_filters(args):
+    """쿼리 파라미터에서 필터 조건 추출 (파라미터명 → 검색어)"""
+    return {param: args.get(param, '').strip() for param in FILTER_PARAMS}
+
+def read_search_options(args):
+    """이름 검색 방식 파라미터 (search_mode, fuzzy_distance) 해석"""
+    name_mode = args.get('search_mode', 'auto').strip().lower()
+    if name_mode not in NAME_SEARCH_MODES:
+        raise ValueError(f"search_mode는 {', '.join(NAME_SEARCH_MODES)} 중 하나여야 합니다")
+    fuzzy_distance = args.get('fuzzy_distance', '').strip()
+    fuzzy_distance = min(max(int(fuzzy_distance), 0), 3) if fuzzy_distance else None
+    return {'name_mode': name_mode, 'fuzzy_distance': fuzzy_distance}
+
+def to_index_filters(filters):
+    """필터 조건을 인덱스 컬럼 기준으로 변환"""
+    return {FILTER_PARAMS[param]: value for param, value in filters.items()}
+
+def encode_cursor(sort_by, sort_order, key):
+    """키셋 커서 토큰 생성 (정렬 기준 + 마지막 행의 (값, id))"""
+    payload = json.dumps([sort_by, sort_order, key[0], key[1]], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """키셋 커서 토큰 해석 → (sort_by, sort_order, (값, id))"""
+    padded = token + '=' * (-len(token) % 4)
+    sort_by, sort_order, value, emp_id = json.loads(base64.urlsafe_b64decode(padded).decode('utf-8'))
+    return sort_by, sort_order, (value, emp_id)
+
+
+# --- 데이터 소스 및 스냅샷 교체 ---
+
+POSTGREST_BASE_URL = 'http://localhost:3010'
+
+
+class ContactDirectory:
+    """
+    저장소 + 검색 인덱스 + 정렬 뷰 스냅샷 (생성 후 변경하지 않음).
+    version은 저장소 내용 해시이므로 여러 워커가 같은 데이터를 적재하면 같은 버전(→ 같은 ETag)이 됩니다.
+    """
+
+    __slots__ = ('store', 'index', 'version', 'loaded_at')
+
+    def __init__(self, records, version=None):
+        self.store = EmployeeStore(records)
+        self.index = ContactSearchIndex(self.store)
+        self.version = version if version is not None else self.store.fingerprint()
+        self.loaded_at = datetime.now().isoformat()
+
+
+class FakeEmployeeSource:
+    """가짜 직원 데이터 (기본값, 변경분 없음)"""
+
+    name = 'fake'
+
+    def fetch(self, since=None):
+        return [] if since is not None else generate_fake_employees()
+
+
+class PostgrestEmployeeSource:
+    """PostgREST 테이블에서 직원 데이터 조회 (since 지정 시 updated_at > since 인 행만)"""
+
+    name = 'postgrest'
+
+    def __init__(self, base_url, table, page_size=5000):
+        self.base_url = base_url
+        self.table = table
+        self.page_size = page_size
+
+    def fetch(self, since=None):
+        params = {'order': 'id.asc', 'limit': self.page_size}
+        if since is not None:
+            params['updated_at'] = f'gt.{since}'
+
+        records = []
+        offset = 0
+        while True:
+            params['offset'] = offset
+            response = requests.get(f'{self.base_url}/{self.table}', params=params, timeout=30)
+            response.raise_for_status()
+            batch = response.json()
+            records.extend(batch)
+            if len(batch) < self.page_size:
+                return records
+            offset += self.page_size
+
 
-# 가짜 데이터 생성 (서버 시작 시 한 번만 생성)
-fake_employees = generate_fake_employees()
+class FileEmployeeSource:
+    """CSV/JSONL 파일에서 직원 데이터 조회 (파일이 바뀌었을 때만 다시 읽음)"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+
+    def _read(self):
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            if self.path.lower().endswith('.csv'):
+                return list(csv.DictReader(f))
+            return [json.loads(line) for line in f if line.strip()]
+
+    def fetch(self, since=None):
+        mtime = os.path.getmtime(self.path)
+        if since is not None and mtime == self._mtime:
+            return []
+        self._mtime = mtime
+        records = self._read()
+        if since is not None:
+            records = [record for record in records if str(record.get('updated_at') or '') > since]
+        return records
+
+
+def create_data_source(config):
+    """설정(data_source)에 맞는 데이터 소스 생성: fake(기본) / postgrest / file"""
+    source_type = config.get('data_source', 'fake')
+    if source_type == 'postgrest':
+        return PostgrestEmployeeSource(config.get('data_url', POSTGREST_BASE_URL), config.get('data_table', 'employee_table'))
+    if source_type == 'file':
+        return FileEmployeeSource(config['data_file'])
+    if source_type == 'fake':
+        return FakeEmployeeSource()
+    raise ValueError(f"지원하지 않는 data_source입니다: {source_type}")
+
+
+def merge_records(store, changed):
+    """기존 저장소 행에 변경분(id 기준)을 덮어쓰고 새 id는 뒤에 추가"""
+    changed_by_id = {int(record['id']): record for record in changed}
+    merged = []
+    for row, emp_id in enumerate(store.ids):
+        record = changed_by_id.pop(emp_id, None)
+        merged.append(record if record is not None else store.row(row))
+    merged.extend(changed_by_id.values())
+    return merged
+
+
+class DirectoryRefresher:
+    """
+    백그라운드 증분 갱신.
+    변경분을 반영한 새 스냅샷을 완전히 만든 뒤 전역 directory 참조를 한 번에 교체하므로
+    요청 처리 중인 스레드는 잠금 없이 이전 스냅샷을 계속 사용합니다.
+    """
+
+    def __init__(self, source, interval=60, full_every=60):
+        self.source = source
+        self.interval = interval
+        self.full_every = full_every  # 하드 삭제 반영을 위해 N회마다 전체 재적재
+        self.last_sync = None
+        self.last_refresh = None
+        self.last_error = None
+        self.refresh_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def refresh(self):
+        """한 번 갱신 - 변경이 반영되었으면 True"""
+        global directory
+        with self._lock:
+            full = self.last_sync is None or (self.full_every and self.refresh_count % self.full_every == 0)
+            changed = self.source.fetch(None if full else self.last_sync)
+            self.refresh_count += 1
+            self.last_refresh = datetime.now().isoformat()
+            self.last_error = None
+            if not full and not changed:
+                return False
+
+            current = directory
+            records = changed if full else merge_records(current.store, changed)
+            directory = ContactDirectory(records)
+
+            synced = [str(record['updated_at']) for record in changed if record.get('updated_at')]
+            if synced:
+                self.last_sync = max(synced + ([self.last_sync] if self.last_sync else []))
+            elif self.last_sync is None:
+                self.last_sync = datetime.now().isoformat()
+            return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self.refresh():
+                    print(f"🔄 직원 데이터 갱신 완료: {directory.version}, {len(directory.store)}명")
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ 직원 데이터 갱신 실패: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='contact-refresher', daemon=True)
+        self._thread.start()
+
+    def status(self):
+        return {
+            'source': self.source.name,
+            'interval': self.interval,
+            'last_sync': self.last_sync,
+            'last_refresh': self.last_refresh,
+            'last_error': self.last_error
+        }
+
+
+# --- 응답 캐시 ---
+
+class ResponseCache:
+    """
+    /api/contacts 응답 LRU 캐시.
+    키는 정규화된 쿼리 파라미터 + 데이터 버전이며, ETag도 같은 키에서 만들어집니다.
+    데이터가 교체되면 버전이 바뀌므로 이전 항목은 더 이상 조회되지 않고 LRU로 밀려납니다.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(version, params):
+        return json.dumps([version, sorted(params.items())], ensure_ascii=False)
+
+    @staticmethod
+    def make_etag(key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+contacts_cache = ResponseCache()
+
+
+def cached_json_response(body, etag):
+    """캐시된 JSON 본문으로 응답 생성 (브라우저는 매번 If-None-Match로 재검증)"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# --- 아바타 캐시 ---
+
+AVATAR_COLORS = ('#F44336', '#E91E63', '#9C27B0', '#673AB7', '#3F51B5', '#2196F3', '#009688',
+                 '#4CAF50', '#FF9800', '#FF5722', '#795548', '#607D8B')
+AVATAR_PHOTO_TYPES = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.webp': 'image/webp'}
+AVATAR_MAX_AGE = 7 * 24 * 60 * 60
+AVATAR_SAFE_NAME = re.compile(r'[A-Za-z0-9_-]{1,64}')  # 사진 파일명으로 쓸 수 있는 사번
+
+
+def avatar_initials(name):
+    """아바타에 표시할 글자 (한글 세 글자 이름은 이름 두 글자, 그 외는 단어 첫 글자)"""
+    name = (name or '').strip()
+    if not name:
+        return '?'
+    if HANGUL_BASE <= ord(name[0]) <= HANGUL_LAST:
+        return name[1:3] if len(name) == 3 else name[:2]
+    return ''.join(word[0] for word in name.split()[:2]).upper()
+
+def render_avatar_svg(emp_id, name):
+    """이니셜 SVG 아바타 생성"""
+    color = AVATAR_COLORS[int(hashlib.md5(str(emp_id).encode()).hexdigest(), 16) % len(AVATAR_COLORS)]
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="128" height="128" viewBox="0 0 128 128">'
+        f'<rect width="128" height="128" rx="64" fill="{color}"/>'
+        '<text x="64" y="64" dy=".35em" text-anchor="middle" font-family="sans-serif" '
+        f'font-size="44" fill="#FFFFFF">{html.escape(avatar_initials(name))}</text></svg>'
+    ).encode('utf-8')
+
+
+class AvatarCache:
+    """
+    아바타 이미지 디스크 캐시.
+    이미지는 내용 해시(sha256) 경로에 한 번만 저장되고, 현재 데이터 버전의 직원 id → 해시 매핑을
+    메모리에 두어 같은 아바타를 다시 요청하면 생성 없이 파일을 그대로 전송합니다.
+    source_dir에 {사번}.png/.jpg 사진이 있으면 생성 대신 사진을 사용합니다.
+    """
+
+    def __init__(self, cache_dir, source_dir=None):
+        self.cache_dir = cache_dir
+        self.source_dir = source_dir
+        self._version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.renders = 0
+
+    def _find_photo(self, employee_number):
+        # 사번은 외부 데이터이므로 경로 구분자/상위 경로가 섞이지 않도록 안전한 문자만 허용
+        employee_number = str(employee_number or '')
+        if not self.source_dir or not AVATAR_SAFE_NAME.fullmatch(employee_number):
+            return None
+        for ext, mimetype in AVATAR_PHOTO_TYPES.items():
+            path = os.path.join(self.source_dir, f'{employee_number}{ext}')
+            if os.path.isfile(path):
+                return path, ext, mimetype
+        return None
+
+    def _store(self, content, ext):
+        """내용 해시 경로에 저장 (이미 있으면 그대로 사용)"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = os.path.join(self.cache_dir, digest[:2], digest + ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return digest, path
+
+    def get(self, version, store, row):
+        """아바타 (etag, 파일 경로, mimetype)"""
+        emp_id = store.ids[row]
+        entry = self._entries.get(emp_id) if version == self._version else None
+        if entry is not None and os.path.exists(entry[1]):
+            return entry
+
+        photo = self._find_photo(store.value('employee_number', row))
+        if photo:
+            with open(photo[0], 'rb') as f:
+                content = f.read()
+            ext, mimetype = photo[1], photo[2]
+        else:
+            content = render_avatar_svg(emp_id, store.value('full_name', row))
+            ext, mimetype = '.svg', 'image/svg+xml'
+        digest, path = self._store(content, ext)
+
+        entry = (digest, path, mimetype)
+        with self._lock:
+            self.renders += 1
+            # 데이터가 교체되면 이전 버전 매핑은 한 번에 비움 (교체 전에 시작된 요청 결과는 저장하지 않음)
+            if version != directory.version:
+                return entry
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+            self._entries[emp_id] = entry
+        return entry
+
+    def stats(self):
+        return {'cache_dir': self.cache_dir, 'entries': len(self._entries), 'renders': self.renders}
+
+
+avatar_cache = AvatarCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'avatar_cache'))
+
+
+# 가짜 데이터 생성 (서버 시작 시 한 번만 생성, 데이터 소스 설정 시 교체됨)
+directory = ContactDirectory(generate_fake_employees())
+refresher = None
 
 @app.route('/api/contacts', methods=['GET'])
 def get_contacts():
     """직원 연락처 목록 조회 API - 웹 페이지 호출용"""
     try:
         # 쿼리 파라미터 가져오기
-        fullname = request.args.get('fullname', '').strip()
-        emailaddress = request.args.get('emailaddress', '').strip()
-        departmentname = request.args.get('departmentname', '').strip()
-        companyname = request.args.get('companyname', '').strip()
-        position = request.args.get('position', '').strip()
-        location = request.args.get('location', '').strip()
+        filters = read_contact_filters(request.args)
+        try:
+            search_options = read_search_options(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'data': [],
+                'message': f'잘못된 검색 옵션입니다: {e}'
+            }), 400
         
         # 페이지네이션 파라미터
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 20))
         offset = (page - 1) * limit
+        after = request.args.get('after', '').strip()
+        facet_params = read_facet_params(request.args.get('facets', ''))
         
         # 정렬 파라미터
         sort_by = request.args.get('sort_by', 'full_name')
         sort_order = request.args.get('sort_order', 'asc').lower()
+        descending = sort_order == 'desc'
         
-        # 필터링 적용
-        filtered_employees = fake_employees.copy()
-        
-        if fullname:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if fullname.lower() in emp['full_name'].lower()]
-        
-        if emailaddress:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if emailaddress.lower() in emp['email_address'].lower()]
-        
-        if departmentname:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if departmentname.lower() in emp['department_name'].lower()]
-        
-        if companyname:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if companyname.lower() in emp['company_name'].lower()]
-                                
-        if position:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if position.lower() in emp['position'].lower()]
-                                
-        if location:
-            filtered_employees = [emp for emp in filtered_employees 
-                                if location.lower() in emp['location'].lower()]
-        
-        # 정렬 적용
-        reverse_sort = sort_order == 'desc'
-        if sort_by in ['full_name', 'department_name', 'company_name', 'position', 'location']:
-            filtered_employees.sort(key=lambda x: x.get(sort_by, ''), reverse=reverse_sort)
+        # 요청 처리 중에는 같은 스냅샷만 사용 (백그라운드 교체와 무관)
+        current = directory
+        contact_index = current.index
         
-        # 총 개수
-        total_count = len(filtered_employees)
+        # 정규화된 파라미터 + 데이터 버전으로 캐시 키/ETag 결정
+        cache_key = ResponseCache.make_key(current.version, {
+            **filters,
+            'page': page, 'limit': limit, 'after': after, 'sort_by': sort_by, 'sort_order': sort_order,
+            'facets': ','.join(facet_params), **search_options
+        })
+        etag = ResponseCache.make_etag(cache_key)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
         
-        # 페이지네이션 적용
-        paginated_employees = filtered_employees[offset:offset + limit]
+        cached_body = contacts_cache.get(cache_key)
+        if cached_body is not None:
+            return cached_json_response(cached_body, etag)
         
-        # 응답 데이터 구성
-        response = {
-            'success': True,
-            'data': paginated_employees,
-            'pagination': {
+        # 필터링 적용 (인덱스 비트셋 교집합)
+        matched = contact_index.search(to_index_filters(filters), **search_options)
+        
+        # 총 개수
+        total_count = bitset_count(matched)
+        
+        if after:
+            # 키셋(커서) 페이지네이션: 이전 페이지 마지막 행 다음부터 조회
+            try:
+                cursor_sort_by, cursor_sort_order, cursor_key = decode_cursor(after)
+            except (ValueError, TypeError):
+                cursor_sort_by = cursor_sort_order = cursor_key = None
+            if (cursor_sort_by not in SORT_FIELDS or cursor_sort_by != sort_by
+                    or cursor_sort_order != sort_order or not isinstance(cursor_key[0], str)
+                    or not isinstance(cursor_key[1], int) or isinstance(cursor_key[1], bool)):
+                return jsonify({
+                    'success': False,
+                    'data': [],
+                    'message': '잘못된 after 커서입니다. 같은 sort_by/sort_order로 받은 next_after 값을 사용하세요.'
+                }), 400
+            rows = contact_index.page_after(matched, sort_by, descending, cursor_key, limit + 1)
+            has_next = len(rows) > limit
+            rows = rows[:limit]
+            pagination = {
+                'total': total_count,
+                'limit': limit,
+                'after': after,
+                'has_next': has_next,
+                'has_prev': True
+            }
+        else:
+            # 기존 page/limit 페이지네이션 (미리 계산된 정렬 순열 사용)
+            rows = contact_index.page(matched, sort_by, descending, offset, limit)
+            has_next = offset + limit < total_count
+            pagination = {
                 'total': total_count,
                 'page': page,
                 'limit': limit,
                 'offset': offset,
                 'pages': (total_count + limit - 1) // limit,
-                'has_next': offset + limit < total_count,
+                'has_next': has_next,
                 'has_prev': page > 1
-            },
-            'filters': {
-                'fullname': fullname,
-                'emailaddress': emailaddress,
-                'departmentname': departmentname,
-                'companyname': companyname,
-                'position': position,
-                'location': location
-            },
+            }
+        
+        # 다음 페이지 커서 (정렬 가능한 컬럼일 때만)
+        if has_next and rows and sort_by in SORT_FIELDS:
+            pagination['next_after'] = encode_cursor(sort_by, sort_order, contact_index.sort_key(sort_by, rows[-1]))
+        
+        # 반환할 페이지의 행만 dict로 변환
+        paginated_employees = current.store.rows(rows)
+        
+        # 응답 데이터 구성
+        response = {
+            'success': True,
+            'data': paginated_employees,
+            'pagination': pagination,
+            'filters': filters,
+            'search_mode': search_options['name_mode'],
             'sort': {
                 'sort_by': sort_by,
                 'sort_order': sort_order
             },
             'timestamp': datetime.now().isoformat()
         }
+        if facet_params:
+            response['facets'] = build_facets(contact_index, filters, facet_params, search_options)
         
-        return jsonify(response)
+        body = jsonify(response).get_data()
+        contacts_cache.put(cache_key, body)
+        return cached_json_response(body, etag)
         
     except Exception as e:
         print(f"Contact API Error: {e}")
@@ -204,15 +1228,133 @@ def get_contacts():
         }), 500
 
 
+@app.route('/api/contacts/facets', methods=['GET'])
+def get_contact_facets():
+    """필터 드롭다운용 값별 직원 수 API - 현재 필터 조건 기준"""
+    try:
+        filters = read_contact_filters(request.args)
+        facet_params = read_facet_params(request.args.get('facets', 'all'))
+        try:
+            search_options = read_search_options(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'data': {},
+                'message': f'잘못된 검색 옵션입니다: {e}'
+            }), 400
+        
+        current = directory
+        return jsonify({
+            'success': True,
+            'data': build_facets(current.index, filters, facet_params, search_options),
+            'total': bitset_count(current.index.search(to_index_filters(filters), **search_options)),
+            'filters': filters,
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        print(f"Contact Facets API Error: {e}")
+        return jsonify({
+            'success': False,
+            'data': {},
+            'message': '서버 오류가 발생했습니다.',
+            'error': str(e) if app.debug else None
+        }), 500
+
+
+@app.route('/api/contacts/export', methods=['GET'])
+def export_contacts():
+    """직원 연락처 전체 내보내기 API - get_contacts와 같은 필터/정렬, NDJSON 또는 CSV 스트리밍"""
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({
+            'success': False,
+            'message': "format은 'ndjson' 또는 'csv'이어야 합니다."
+        }), 400
+
+    filters = read_contact_filters(request.args)
+    try:
+        search_options = read_search_options(request.args)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': f'잘못된 검색 옵션입니다: {e}'
+        }), 400
+    sort_by = request.args.get('sort_by', 'full_name')
+    descending = request.args.get('sort_order', 'asc').lower() == 'desc'
+
+    # 스트리밍 도중 데이터가 교체되어도 같은 스냅샷으로 끝까지 내보냄
+    current = directory
+    matched = current.index.search(to_index_filters(filters), **search_options)
+    batches = current.index.iter_rows(matched, sort_by, descending)
+
+    def generate_ndjson():
+        for rows in batches:
+            yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in current.store.rows(rows))
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EMPLOYEE_COLUMNS)
+        yield '\ufeff' + buffer.getvalue()  # 엑셀 한글 표시용 BOM
+        for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                writer.writerow([current.store.value(column, row) for column in EMPLOYEE_COLUMNS])
+            yield buffer.getvalue()
+
+    filename = f"contacts_{datetime.now().strftime('%Y%m%d')}.{'csv' if export_format == 'csv' else 'ndjson'}"
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'X-Total-Count': str(bitset_count(matched)),
+        'X-Data-Version': str(current.version)
+    }
+    if export_format == 'csv':
+        return Response(generate_csv(), mimetype='text/csv', headers=headers)
+    return Response(generate_ndjson(), mimetype='application/x-ndjson', headers=headers)
+
+
+@app.route('/api/avatar/<int:emp_id>', methods=['GET'])
+def get_avatar(emp_id):
+    """직원 아바타 이미지 API - 디스크 캐시 파일을 그대로 전송 (ETag/Cache-Control 포함)"""
+    current = directory
+    row = current.store.row_of(emp_id)
+    if row is None:
+        return jsonify({'success': False, 'message': '해당 직원을 찾을 수 없습니다.'}), 404
+
+    try:
+        etag, path, mimetype = avatar_cache.get(current.version, current.store, row)
+    except OSError as e:
+        print(f"Avatar API Error: {e}")
+        return jsonify({
+            'success': False,
+            'message': '아바타 이미지를 불러올 수 없습니다.',
+            'error': str(e) if app.debug else None
+        }), 500
+
+    response = send_file(path, mimetype=mimetype, etag=etag, max_age=AVATAR_MAX_AGE, conditional=True)
+    response.cache_control.public = True
+    return response
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """헬스체크"""
+    current = directory
     return jsonify({
         'status': 'healthy',
         'service': 'Contact API',
         'version': '2.0.0',
         'timestamp': datetime.now().isoformat(),
-        'total_contacts': len(fake_employees)
+        'total_contacts': len(current.store),
+        'memory': current.store.memory_footprint(),
+        'response_cache': contacts_cache.stats(),
+        'avatar_cache': avatar_cache.stats(),
+        'data': {
+            'version': current.version,
+            'loaded_at': current.loaded_at,
+            **(refresher.status() if refresher else {'source': 'fake'})
+        }
     })
 
 @app.route('/openapi.yaml')
@@ -234,8 +1376,26 @@ if __name__ == '__main__':
     port = int(config['port'])
     debug = os.environ.get('DEBUG', 'true').lower() == 'true'
     
+    contacts_cache.max_entries = int(config.get('response_cache_size', contacts_cache.max_entries))
+    avatar_cache.cache_dir = config.get('avatar_cache_dir', avatar_cache.cache_dir)
+    avatar_cache.source_dir = config.get('avatar_source_dir')
+    
+    # 직원 데이터 소스 설정 (data_source 미설정 시 가짜 데이터 유지)
+    if config.get('data_source', 'fake') != 'fake':
+        try:
+            refresher = DirectoryRefresher(
+                create_data_source(config),
+                interval=int(config.get('refresh_interval', 60)),
+                full_every=int(config.get('full_refresh_every', 60))
+            )
+            refresher.refresh()
+            refresher.start()
+        except Exception as e:
+            print(f"❌ 직원 데이터 로드 실패: {e}")
+            exit(1)
+    
     print(f"🌐 Contact API for Web starting on {host}:{port}")
-    print(f"📊 Total contacts loaded: {len(fake_employees)}")
+    print(f"📊 Total contacts loaded: {len(directory.store)} ({refresher.source.name if refresher else 'fake'})")
     print(f"🔍 Simplified features: pagination, filtering, sorting")
     print(f"⚙️  Configuration loaded from database")
     
@@ -12,8 +12,12 @@ PostgREST API를 통해 PostgreSQL에 저장하고, 요청한 형식으로 환
 2. DB → API 데이터 제공 (db2api) - 영업일 기준 환율 조회
    GET /exchange_db2api?days=7&format=web
    GET /exchange_db2api?days=14&format=chat
+   (메모리 환율 시계열에서 응답, 동기화 성공 시 갱신)
    
-3. 헬스체크
+3. 동기화 작업 상태 조회
+   GET /exchange_sync_status?job_id=...
+
+4. 헬스체크
    GET /health
 """
 
@@ -26,6 +30,14 @@ import urllib3
 import os
 import sys
 import atexit
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
@@ -118,6 +130,19 @@ EXCHANGE_RATES_TABLE = config['exchange']['database']['table_name']
 EXCHANGE_API_BASE_URL = config['exchange']['api']['base_url']
 EXCHANGE_API_AUTH_KEY = config['exchange']['api']['auth_key']
 
+# 한국수출입은행 API 호출 설정 (DB 설정값이 없으면 기본값)
+EXCHANGE_API_MAX_WORKERS = int(config['exchange']['api'].get('max_workers', 8))      # 동시 호출 수
+EXCHANGE_API_RATE_LIMIT = float(config['exchange']['api'].get('rate_limit', 10))     # 호스트별 초당 최대 호출 수 (0이면 제한 없음)
+EXCHANGE_API_MAX_RETRIES = int(config['exchange']['api'].get('max_retries', 3))      # 일시 오류 재시도 횟수
+EXCHANGE_API_TIMEOUT = float(config['exchange']['api'].get('timeout', 15))           # 호출당 타임아웃(초)
+
+# 대량 저장 시 upsert 요청 하나에 담을 최대 행 수
+EXCHANGE_UPSERT_CHUNK_SIZE = int(config['exchange']['database'].get('upsert_chunk_size', 500))
+
+# db2api가 최신 데이터 누락으로 백그라운드 동기화를 다시 시작하기 전 최소 간격(초)
+# (수출입은행은 당일 환율을 오전에 공시하므로 그 전에는 동기화해도 데이터가 없음)
+SYNC_RETRY_INTERVAL = int(config['exchange'].get('scheduler', {}).get('retry_interval', 600))
+
 # 지원 통화 목록 (한국수출입은행 API 기준)
 CURRENCIES = ['USD', 'EUR', 'JPY100', 'CNH']
 
@@ -128,32 +153,151 @@ def now_kst():
 def today_kst():
     return now_kst().date()
 
+# =================================================================
+# ===== 한국 영업일 달력 (주말 + 공휴일 제외) ======================
+# =================================================================
+
+# 매년 같은 날짜인 공휴일 (월, 일)
+FIXED_HOLIDAYS = [(1, 1), (3, 1), (5, 5), (6, 6), (8, 15), (10, 3), (10, 9), (12, 25)]
+
+# 연도별 음력 공휴일(설날/부처님오신날/추석)·대체공휴일·선거일·임시공휴일
+# (한국천문연구원 월력요항 기준, 새 연도 발표 시 추가. 표에 없는 연도는 주말만 제외)
+KOREAN_HOLIDAYS = {
+    2020: ['2020-01-24', '2020-01-25', '2020-01-26', '2020-01-27', '2020-04-15', '2020-04-30',
+           '2020-08-17', '2020-09-30', '2020-10-01', '2020-10-02'],
+    2021: ['2021-02-11', '2021-02-12', '2021-02-13', '2021-05-19', '2021-08-16', '2021-09-20',
+           '2021-09-21', '2021-09-22', '2021-10-04', '2021-10-11'],
+    2022: ['2022-01-31', '2022-02-01', '2022-02-02', '2022-03-09', '2022-05-08', '2022-06-01',
+           '2022-09-09', '2022-09-10', '2022-09-11', '2022-09-12', '2022-10-10'],
+    2023: ['2023-01-21', '2023-01-22', '2023-01-23', '2023-01-24', '2023-05-27', '2023-05-29',
+           '2023-09-28', '2023-09-29', '2023-09-30', '2023-10-02'],
+    2024: ['2024-02-09', '2024-02-10', '2024-02-11', '2024-02-12', '2024-04-10', '2024-05-06',
+           '2024-05-15', '2024-09-16', '2024-09-17', '2024-09-18', '2024-10-01'],
+    2025: ['2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-03-03', '2025-05-06',
+           '2025-06-03', '2025-10-05', '2025-10-06', '2025-10-07', '2025-10-08'],
+    2026: ['2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02', '2026-05-24', '2026-05-25',
+           '2026-06-03', '2026-08-17', '2026-09-24', '2026-09-25', '2026-09-26', '2026-10-05'],
+}
+
+# DB 설정으로 추가하는 휴일 (쉼표 구분 YYYY-MM-DD, 표에 없는 임시공휴일 등)
+EXTRA_HOLIDAYS = [d.strip() for d in config['exchange']['api'].get('extra_holidays', '').split(',') if d.strip()]
+
+
+def build_holiday_set():
+    """공휴일 표 → 날짜(date) 집합"""
+    holidays = set()
+    for year, dates in KOREAN_HOLIDAYS.items():
+        holidays.update(datetime(year, month, day).date() for month, day in FIXED_HOLIDAYS)
+        holidays.update(datetime.strptime(d, '%Y-%m-%d').date() for d in dates)
+    for d in EXTRA_HOLIDAYS:
+        try:
+            holidays.add(datetime.strptime(d, '%Y-%m-%d').date())
+        except ValueError:
+            print(f"⚠️ 잘못된 extra_holidays 날짜 무시: {d}")
+    return holidays
+
+
+class BusinessCalendar:
+    """
+    영업일 달력. 공휴일 표 범위(첫 해 1/1 ~ 내년 말)의 영업일 목록과
+    날짜 → "그 날짜 이하 가장 가까운 영업일 위치" 색인을 미리 만들어
+    영업일 여부는 O(1), 이전 N 영업일은 목록 슬라이스로 조회합니다.
+    범위 밖 날짜는 하루씩 거슬러 올라가며 주말/공휴일만 제외합니다.
+    """
+
+    def __init__(self, holidays):
+        self._lock = threading.Lock()
+        self._holidays = set(holidays)
+        self._learned = set()
+        self._build()
+
+    def _build(self):
+        start = datetime(min(KOREAN_HOLIDAYS), 1, 1).date()
+        end = datetime(max(max(KOREAN_HOLIDAYS), today_kst().year + 1), 12, 31).date()
+        days, index = [], {}
+        current = start
+        while current <= end:
+            if current.weekday() < 5 and current not in self._holidays:
+                days.append(current)
+            index[current] = len(days) - 1  # 시작일 이전 영업일이 없으면 -1
+            current += timedelta(days=1)
+        # 조회 스레드는 잠금 없이 읽으므로 한 번에 교체
+        self._state = (start, end, days, index)
+
+    def is_business_day(self, day):
+        """주말/공휴일이 아니면 True"""
+        return day.weekday() < 5 and day not in self._holidays
+
+    def previous_business_days(self, day, count):
+        """day(포함) 이전 영업일 count개 (최신순)"""
+        start, end, days, index = self._state
+        if start <= day <= end:
+            position = index[day]
+            if position + 1 >= count:
+                return days[position - count + 1:position + 1][::-1]
+        result = []
+        current = day
+        while len(result) < count:
+            if self.is_business_day(current):
+                result.append(current)
+            current -= timedelta(days=1)
+        return result
+
+    def business_days_between(self, first, last):
+        """first ~ last(포함) 사이 영업일 (오래된 순)"""
+        start, end, days, index = self._state
+        if start <= first and last <= end:
+            begin = index[first - timedelta(days=1)] + 1 if first > start else 0
+            return days[begin:index[last] + 1]
+        result = []
+        current = first
+        while current <= last:
+            if self.is_business_day(current):
+                result.append(current)
+            current += timedelta(days=1)
+        return result
+
+    def add_holidays(self, dates):
+        """표에 없던 휴일 추가 (지난 평일인데 수출입은행 데이터가 없던 날 등)"""
+        with self._lock:
+            new = [d for d in dates if d not in self._holidays]
+            if not new:
+                return
+            self._holidays.update(new)
+            self._learned.update(new)
+            self._build()
+        print(f"📅 휴일 추가: {', '.join(d.strftime('%Y-%m-%d') for d in sorted(new))}")
+
+    def stats(self):
+        start, end, days, _ = self._state
+        return {
+            'range': [start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')],
+            'holiday_table_years': [min(KOREAN_HOLIDAYS), max(KOREAN_HOLIDAYS)],
+            'business_days': len(days),
+            'learned_holidays': sorted(d.strftime('%Y-%m-%d') for d in self._learned)
+        }
+
+
+business_calendar = BusinessCalendar(build_holiday_set())
+
 def get_business_days(days):
-    """영업일 계산 함수 (주말 제외)"""
-    result = []
+    """영업일 계산 함수 (주말/공휴일 제외, 최신순)"""
     # 한국(서울) 시간 기준으로 날짜 계산
-    current = now_kst()
-    count = 0
-    while count < days:
-        if current.weekday() < 5:  # 월-금
-            result.append(current.date())
-            count += 1
-        current -= timedelta(days=1)
-    return result
+    return business_calendar.previous_business_days(today_kst(), days)
 
-def postgrest_request(method, endpoint, data=None, params=None):
+def postgrest_request(method, endpoint, data=None, params=None, prefer='return=representation'):
     """PostgREST API 요청 헬퍼 함수"""
     url = f"{POSTGREST_BASE_URL}/{endpoint}"
     headers = {
         'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
+        'Prefer': prefer
     }
     
     try:
         if method.upper() == 'GET':
             response = requests.get(url, headers=headers, params=params, timeout=30)
         elif method.upper() == 'POST':
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = requests.post(url, headers=headers, json=data, params=params, timeout=30)
         elif method.upper() == 'PATCH':
             response = requests.patch(url, headers=headers, json=data, params=params, timeout=30)
         elif method.upper() == 'DELETE':
@@ -169,7 +313,345 @@ def postgrest_request(method, endpoint, data=None, params=None):
         return {"success": True, "data": response.json() if response.text else []}
         
     except requests.exceptions.RequestException as e:
-        return {"success": False, "error": str(e)}
+        # status_code: PostgREST가 응답한 HTTP 상태 (연결 오류/타임아웃이면 None)
+        status_code = e.response.status_code if getattr(e, 'response', None) is not None else None
+        return {"success": False, "error": str(e), "status_code": status_code}
+
+# =================================================================
+# ===== 외부 환율 API 병렬 호출 (레이트 리밋 + 재시도) =============
+# =================================================================
+
+class RateLimiter:
+    """호스트별 최소 호출 간격을 보장하는 스레드 안전 레이트 리미터"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TransientAPIError(Exception):
+    """재시도할 만한 외부 API 오류 (429/5xx, 잘못된 응답 본문)"""
+
+
+exchange_api_limiter = RateLimiter(EXCHANGE_API_RATE_LIMIT)
+
+# 병렬 호출 스레드들이 keep-alive 연결을 재사용하도록 공용 세션 사용
+exchange_api_session = requests.Session()
+exchange_api_session.mount('https://', HTTPAdapter(pool_maxsize=EXCHANGE_API_MAX_WORKERS))
+exchange_api_session.mount('http://', HTTPAdapter(pool_maxsize=EXCHANGE_API_MAX_WORKERS))
+
+
+def parse_exim_rates(date, api_data):
+    """수출입은행 응답 → exchange_rates 저장 행"""
+    rates_dict = {cur: None for cur in CURRENCIES}
+    for item in api_data:
+        cur_unit = item.get('cur_unit', '').strip()
+        deal_bas_r = item.get('deal_bas_r', '0')
+        try:
+            rate_value = float(deal_bas_r.replace(',', ''))
+            if cur_unit == 'JPY(100)':
+                rates_dict['JPY100'] = rate_value
+            elif cur_unit in rates_dict:
+                rates_dict[cur_unit] = rate_value
+        except:
+            continue
+
+    return {
+        'date': date.strftime('%Y-%m-%d'),
+        'usd': rates_dict['USD'],
+        'eur': rates_dict['EUR'],
+        'jpy100': rates_dict['JPY100'],
+        'cnh': rates_dict['CNH']
+    }
+
+
+def fetch_exim_rates(date):
+    """
+    하루치 환율 조회. 저장할 행(dict) 또는 데이터 없음(휴일 등)이면 None.
+    연결 오류/타임아웃/429/5xx는 지수 백오프(+지터)로 재시도하고, 끝내 실패하면 마지막 예외를 그대로 발생시킵니다.
+    """
+    params = {'authkey': EXCHANGE_API_AUTH_KEY, 'searchdate': date.strftime("%Y%m%d"), 'data': 'AP01'}
+    host = urlsplit(EXCHANGE_API_BASE_URL).netloc
+    for attempt in range(EXCHANGE_API_MAX_RETRIES + 1):
+        exchange_api_limiter.wait(host)
+        try:
+            response = exchange_api_session.get(EXCHANGE_API_BASE_URL, params=params, verify=False,
+                                                timeout=EXCHANGE_API_TIMEOUT)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise TransientAPIError(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            try:
+                api_data = response.json()
+            except ValueError as e:
+                raise TransientAPIError(f"잘못된 응답 본문: {e}")
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TransientAPIError):
+            if attempt == EXCHANGE_API_MAX_RETRIES:
+                raise
+            time.sleep(min(8.0, 0.5 * 2 ** attempt) * (0.5 + random.random()))
+            continue
+
+        if not api_data:  # 휴일 등 데이터가 없는 경우
+            return None
+        return parse_exim_rates(date, api_data)
+
+
+def fetch_exim_rates_concurrently(dates):
+    """
+    여러 날짜를 스레드 풀로 병렬 조회 (동시 호출 수/호스트별 호출 속도 제한).
+    ({날짜: 저장할 행 또는 None}, 실패한 날짜 목록) 반환.
+    """
+    results, failed = {}, []
+    if not dates:
+        return results, failed
+    with ThreadPoolExecutor(max_workers=min(EXCHANGE_API_MAX_WORKERS, len(dates)),
+                            thread_name_prefix='exim-fetch') as executor:
+        futures = {date: executor.submit(fetch_exim_rates, date) for date in dates}
+        for date, future in futures.items():
+            try:
+                results[date] = future.result()
+            except Exception as e:
+                print(f"⚠️ {date} 환율 조회 실패: {e}")
+                failed.append(date)
+    return results, failed
+
+# =================================================================
+# ===== 환율 데이터 일괄 저장 (date 기준 upsert) ===================
+# =================================================================
+
+def upsert_exchange_rates(rows):
+    """
+    환율 행을 date 기준으로 upsert (PostgREST Prefer: resolution=merge-duplicates, date UNIQUE 제약 필요).
+    신규/기존 날짜를 한 요청으로 저장하며, 행이 많으면 EXCHANGE_UPSERT_CHUNK_SIZE 단위로 나눕니다.
+    PostgREST가 행을 거부하면(4xx) 절반씩 나눠 다시 시도해 실제로 실패한 날짜만 골라내고,
+    연결 오류/타임아웃/5xx면 나눠도 소용없으므로 남은 행 전체를 바로 실패로 처리합니다.
+    (저장된 날짜 목록, 실패한 날짜 목록) 반환.
+    """
+    saved, failed = [], []
+
+    def save(chunk):
+        """chunk 저장. PostgREST를 사용할 수 없으면(연결 오류/5xx) False"""
+        result = postgrest_request('POST', EXCHANGE_RATES_TABLE, data=chunk,
+                                   params={'on_conflict': 'date'},
+                                   prefer='resolution=merge-duplicates,return=representation')
+        if result['success']:
+            saved.extend(row['date'] for row in result['data'])
+            return True
+        status_code = result.get('status_code')
+        if status_code is None or status_code >= 500:
+            print(f"⚠️ 환율 저장 실패 (PostgREST 사용 불가, {len(chunk)}건): {result['error']}")
+            failed.extend(row['date'] for row in chunk)
+            return False
+        if len(chunk) == 1:
+            print(f"⚠️ {chunk[0]['date']} 환율 저장 실패: {result['error']}")
+            failed.append(chunk[0]['date'])
+            return True
+        half = len(chunk) // 2
+        return save(chunk[:half]) and save(chunk[half:])
+
+    for i in range(0, len(rows), EXCHANGE_UPSERT_CHUNK_SIZE):
+        if not save(rows[i:i + EXCHANGE_UPSERT_CHUNK_SIZE]):
+            failed.extend(row['date'] for row in rows[i + EXCHANGE_UPSERT_CHUNK_SIZE:])
+            break
+    return saved, failed
+
+# =================================================================
+# ===== 메모리 환율 시계열 + 응답 캐시 =============================
+# =================================================================
+
+class RateSeries:
+    """
+    exchange_rates 전체를 날짜 문자열 → 행으로 메모리에 보관.
+    환율은 하루 한 번 동기화 때만 바뀌므로 시작 시 한 번 적재하고 동기화 성공 직후 다시 적재하며,
+    (format, days, 기준 영업일)별로 렌더링한 응답 JSON도 다음 적재 전까지 캐시합니다.
+    """
+
+    def __init__(self, max_responses=512):
+        self.max_responses = max_responses
+        self._rows = {}
+        self._dates = []  # 최신순 날짜
+        self._responses = {}
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        """PostgREST에서 전체 환율을 다시 읽고 응답 캐시를 비움. 실패 시 기존 데이터를 유지하고 False"""
+        result = postgrest_request('GET', EXCHANGE_RATES_TABLE, params={'order': 'date.desc'})
+        if not result['success']:
+            print(f"⚠️ 환율 시계열 적재 실패, 기존 데이터 사용: {result['error']}")
+            return False
+        rows = {row['date']: row for row in result['data']}
+        with self._lock:
+            self._rows = rows
+            self._dates = sorted(rows, reverse=True)
+            self._responses = {}
+            self.loaded_at = now_kst()
+        print(f"📈 환율 시계열 적재 완료: {len(rows)}일")
+        return True
+
+    def ensure_loaded(self):
+        if self.loaded_at is None:
+            self.load()
+
+    def __contains__(self, date_str):
+        return date_str in self._rows
+
+    def rows_for(self, date_strs):
+        """요청 날짜 중 데이터가 있는 행 (요청 순서 유지)"""
+        rows = self._rows
+        return [rows[d] for d in date_strs if d in rows]
+
+    def recent_rows(self, count):
+        """보유한 가장 최근 count일 행 (최신순)"""
+        rows, dates = self._rows, self._dates
+        return [rows[d] for d in dates[:count]]
+
+    def cached_response(self, key):
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cached
+
+    def store_response(self, key, body):
+        with self._lock:
+            if len(self._responses) >= self.max_responses:
+                self._responses.clear()
+            self._responses[key] = body
+
+    def stats(self):
+        with self._lock:
+            return {
+                'days': len(self._rows),
+                'latest_date': max(self._rows) if self._rows else None,
+                'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+                'cached_responses': len(self._responses),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+rate_series = RateSeries()
+
+
+def sync_exchange_data():
+    """환율 동기화 후 성공하면 메모리 시계열과 응답 캐시를 갱신"""
+    result = sync_exchange_data_from_api()
+    if result.get('success'):
+        rate_series.load()
+    return result
+
+# =================================================================
+# ===== 동기화 작업 실행기 (중복 실행 방지 + 백그라운드 실행) ======
+# =================================================================
+
+class SyncJobRunner:
+    """
+    환율 동기화 작업 실행기.
+    한 번에 하나의 작업만 실행하며, 실행 중에 들어온 요청(db2api, api2db, 스케줄러)은 새 작업을 만들지 않고
+    진행 중인 작업을 공유합니다. 최근 작업은 job_id로 상태를 조회할 수 있도록 history개까지 보관합니다.
+    """
+
+    def __init__(self, history=20):
+        self.history = history
+        self._jobs = OrderedDict()   # job_id -> 작업 상태
+        self._done = {}              # job_id -> 완료 이벤트
+        self._current = None
+        self._last_finished = None   # (완료 시각 monotonic, 작업)
+        self._lock = threading.Lock()
+
+    def start(self, trigger, min_interval=0):
+        """
+        백그라운드 작업 시작. (작업, 새로 시작했는지) 반환.
+        실행 중인 작업이 있거나 마지막 작업이 min_interval초 안에 끝났으면 그 작업을 반환합니다.
+        """
+        with self._lock:
+            if self._current is not None:
+                return dict(self._current), False
+            if min_interval and self._last_finished is not None:
+                finished_at, last_job = self._last_finished
+                if time.monotonic() - finished_at < min_interval:
+                    return dict(last_job), False
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'trigger': trigger,
+                'status': 'running',
+                'started_at': now_kst().isoformat(),
+                'finished_at': None,
+                'result': None
+            }
+            self._current = job
+            self._jobs[job['job_id']] = job
+            self._done[job['job_id']] = threading.Event()
+            while len(self._jobs) > self.history:
+                old_id, _ = self._jobs.popitem(last=False)
+                self._done.pop(old_id, None)
+
+        threading.Thread(target=self._execute, args=(job,), name=f"exchange-sync-{job['job_id'][:8]}",
+                         daemon=True).start()
+        return dict(job), True
+
+    def run(self, trigger):
+        """작업을 시작(또는 진행 중인 작업에 합류)하고 끝날 때까지 기다린 뒤 작업 상태 반환"""
+        job, _ = self.start(trigger)
+        with self._lock:
+            done = self._done.get(job['job_id'])
+        if done is not None:
+            done.wait()
+        return self.get(job['job_id']) or job
+
+    def _execute(self, job):
+        try:
+            result = sync_exchange_data()
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        with self._lock:
+            job.update({
+                'status': 'succeeded' if result.get('success') else 'failed',
+                'finished_at': now_kst().isoformat(),
+                'result': result
+            })
+            self._current = None
+            self._last_finished = (time.monotonic(), job)
+            done = self._done.get(job['job_id'])
+        if done is not None:
+            done.set()
+
+    def get(self, job_id=None):
+        """작업 상태 (job_id가 없으면 실행 중이거나 가장 최근 작업)"""
+        with self._lock:
+            if job_id is None:
+                job = self._current or (self._last_finished[1] if self._last_finished else None)
+            else:
+                job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+
+sync_jobs = SyncJobRunner()
+
+
+def sync_job_summary(job):
+    """응답 메타데이터용 작업 요약"""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'status_url': f"/api/exchange_sync_status?job_id={job['job_id']}"
+    }
 
 # =================================================================
 # ===== 3번 항목 수정: api2db 로직 분리 및 스케줄러 직접 호출 =====
@@ -223,12 +705,8 @@ def sync_exchange_data_from_api():
             steps[-1].update({"status": "완료", "details": details})
             return {"success": True, "steps": steps, "summary": "업데이트할 새로운 데이터가 없습니다"}
 
-        business_days = []
-        current = latest_date + timedelta(days=1)
-        while current <= today:
-            if current.weekday() < 5:
-                business_days.append(current)
-            current += timedelta(days=1)
+        # 주말/공휴일은 수출입은행 데이터가 없으므로 호출하지 않음
+        business_days = business_calendar.business_days_between(latest_date + timedelta(days=1), today)
         
         if not business_days:
             details = f"최신 날짜: {latest_date.strftime('%Y-%m-%d')}, 업데이트할 영업일이 없습니다"
@@ -240,80 +718,24 @@ def sync_exchange_data_from_api():
         # Step 3: API 호출 및 데이터 저장
         steps.append({"step": 3, "name": "API 호출 및 데이터 저장", "status": "진행중"})
         
-        # --- 1번 항목 수정: N+1 문제 해결을 위한 일괄 처리 시작 ---
-        # 업데이트 필요한 날짜들에 대해 DB에 이미 데이터가 있는지 한번에 확인
-        date_strs = [d.strftime('%Y-%m-%d') for d in business_days]
-        existing_data_result = postgrest_request('GET', EXCHANGE_RATES_TABLE, params={'date': f'in.({",".join(date_strs)})'})
-        existing_dates = set()
-        if existing_data_result['success']:
-            existing_dates = {item['date'] for item in existing_data_result['data']}
-        # --- 1번 항목 수정 끝 ---
-
-        success_count = 0
         failed_dates = []
-        to_insert = []
-        to_update = []
         
-        for date in business_days:
-            params = {'authkey': EXCHANGE_API_AUTH_KEY, 'searchdate': date.strftime("%Y%m%d"), 'data': 'AP01'}
-            try:
-                response = requests.get(EXCHANGE_API_BASE_URL, params=params, verify=False, timeout=30)
-                response.raise_for_status()
-                api_data = response.json()
+        # 외부 API는 날짜별 호출이므로 병렬로 조회 (동시 호출 수/속도 제한, 일시 오류 재시도)
+        fetched, fetch_failed = fetch_exim_rates_concurrently(business_days)
+        failed_dates.extend(date.strftime("%Y-%m-%d") for date in fetch_failed)
 
-                if not api_data: # 휴일 등 데이터가 없는 경우
-                    continue
-
-                rates_dict = {cur: None for cur in CURRENCIES}
-                for item in api_data:
-                    cur_unit = item.get('cur_unit', '').strip()
-                    deal_bas_r = item.get('deal_bas_r', '0')
-                    try:
-                        rate_value = float(deal_bas_r.replace(',', ''))
-                        if cur_unit == 'JPY(100)':
-                            rates_dict['JPY100'] = rate_value
-                        elif cur_unit in rates_dict:
-                            rates_dict[cur_unit] = rate_value
-                    except:
-                        continue
-                
-                data_to_save = {
-                    'date': date.strftime('%Y-%m-%d'),
-                    'usd': rates_dict['USD'],
-                    'eur': rates_dict['EUR'],
-                    'jpy100': rates_dict['JPY100'],
-                    'cnh': rates_dict['CNH']
-                }
-
-                # --- 1번 항목 수정: 삽입/업데이트 목록 분리 ---
-                if data_to_save['date'] in existing_dates:
-                    to_update.append(data_to_save)
-                else:
-                    to_insert.append(data_to_save)
-                # --- 1번 항목 수정 끝 ---
+        # 지난 평일인데 데이터가 없으면 표에 없는 휴일(임시공휴일 등)로 보고 달력에 반영
+        # (당일은 공시 전일 수 있으므로 제외)
+        business_calendar.add_holidays([date for date in business_days
+                                        if date < today and date in fetched and fetched[date] is None])
 
-            except Exception as e:
-                failed_dates.append(date.strftime("%Y-%m-%d"))
-                continue
-
-        # --- 1번 항목 수정: 일괄 삽입 및 개별 업데이트 실행 ---
-        if to_insert:
-            insert_result = postgrest_request('POST', EXCHANGE_RATES_TABLE, data=to_insert)
-            if insert_result['success']:
-                success_count += len(insert_result['data'])
-            else:
-                # bulk insert 실패 시 개별 날짜를 실패로 기록
-                failed_dates.extend([d['date'] for d in to_insert])
-
-        for item in to_update:
-            update_result = postgrest_request('PATCH', EXCHANGE_RATES_TABLE, 
-                                            data=item,
-                                            params={'date': f"eq.{item['date']}"})
-            if update_result['success']:
-                success_count += 1
-            else:
-                failed_dates.append(item['date'])
-        # --- 1번 항목 수정 끝 ---
+        # 휴일 등 데이터가 없거나 조회에 실패한 날짜는 제외
+        to_save = [fetched[date] for date in business_days if fetched.get(date) is not None]
+
+        # 신규/기존 날짜 구분 없이 date 기준 upsert 한 번(대량이면 chunk 단위)으로 저장
+        saved_dates, save_failed = upsert_exchange_rates(to_save)
+        success_count = len(saved_dates)
+        failed_dates.extend(save_failed)
 
         steps[-1].update({"status": "완료", "details": f"성공: {success_count}일, 실패: {len(failed_dates)}일"})
 
@@ -336,8 +758,8 @@ def run_scheduled_api2db():
     try:
         print(f"[{now_kst()}] 스케줄된 환율 API 업데이트 시작...")
         
-        # Flask 컨텍스트 없이 핵심 로직 함수를 직접 호출
-        result = sync_exchange_data_from_api()
+        # Flask 컨텍스트 없이 핵심 로직을 실행 (db2api가 시작한 작업이 진행 중이면 그 작업을 공유)
+        result = sync_jobs.run('scheduler')['result']
         
         if result.get('success'):
             print(f"[{now_kst()}] 스케줄된 환율 API 업데이트 성공: {result.get('summary', '')}")
@@ -352,20 +774,105 @@ def api2db():
     """
     [수정됨] 한국수출입은행 환율 API → 데이터베이스 저장 기능.
     핵심 로직을 호출하고 결과를 JSON으로 변환하여 반환하는 '창구' 역할만 수행합니다.
+    background=true면 작업만 시작하고 202와 job_id를 즉시 반환합니다 (상태는 /api/exchange_sync_status).
     """
-    result = sync_exchange_data_from_api()
+    if request.args.get('background', 'false').lower() == 'true':
+        job, started = sync_jobs.start('api')
+        return jsonify({"success": True, "started": started, "job": sync_job_summary(job)}), 202
+
+    job = sync_jobs.run('api')
+    result = dict(job['result'], job_id=job['job_id'])
     status_code = 200 if result.get('success') else 500
     return jsonify(result), status_code
 
+@app.route('/api/exchange_sync_status', methods=['GET'])
+def sync_status():
+    """동기화 작업 상태 조회 (job_id 미지정 시 실행 중이거나 가장 최근 작업)"""
+    job = sync_jobs.get(request.args.get('job_id'))
+    if job is None:
+        return jsonify({"error": "해당 동기화 작업을 찾을 수 없습니다"}), 404
+    return jsonify({"success": True, "job": job})
+
 # =================================================================
 # ===== 1번 항목 수정: db2api 성능 최적화 ==========================
 # =================================================================
 
+def render_exchange_rates(format_type, days, db_data, extra_metadata=None):
+    """최신순 환율 행 → format(web/chat)별 응답. (Response, 상태 코드) 반환"""
+    if format_type == 'web':
+        # 이미 가져온 데이터(db_data)를 가공하기만 함
+        web_data = []
+        for row in db_data:
+            web_data.append({
+                'date': row['date'],
+                'USD': float(row.get('usd') or 0.0),
+                'EUR': float(row.get('eur') or 0.0),
+                'JPY100': float(row.get('jpy100') or 0.0),
+                'CNH': float(row.get('cnh') or 0.0)
+            })
+
+        return jsonify({
+            'success': True,
+            'data': web_data,
+            'metadata': {
+                'total_days': len(web_data),
+                'requested_days': days,
+                'latest_date': web_data[0]['date'],
+                'available_currencies': CURRENCIES,
+                'format': 'web',
+                'description': 'All rates are based on KRW. JPY100 means 100 yen.',
+                **(extra_metadata or {})
+            }
+        }), 200
+    
+    elif format_type == 'chat':
+        # 이미 가져온 데이터(db_data)에서 최신 2일치 데이터를 사용
+        if len(db_data) < 2:
+            return jsonify({"error": "변화율 계산을 위해 최소 2일의 데이터가 필요합니다"}), 404
+            
+        today_data = db_data[0]
+        yesterday_data = db_data[1]
+        formatted_rates = {}
+        
+        for currency in CURRENCIES:
+            key = currency.lower() # DB 컬럼명은 소문자
+            today_rate = today_data.get(key)
+            yest_rate = yesterday_data.get(key)
+
+            if today_rate is not None and yest_rate is not None and yest_rate != 0:
+                change_rate = ((today_rate - yest_rate) / yest_rate) * 100
+                formatted_rates[currency] = round(today_rate, 2)
+                # 변동율을 소수점 첫째자리까지만 표시
+                formatted_rates[f"{currency}_trend"] = round(change_rate, 1)
+                # 색상 정보 추가: 상승은 red, 하락은 blue
+                if change_rate > 0:
+                    formatted_rates[f"{currency}_color"] = "Attention"
+                elif change_rate < 0:
+                    formatted_rates[f"{currency}_color"] = "Accent"
+                else:
+                    formatted_rates[f"{currency}_color"] = "Default"  # 변동 없음
+
+        return jsonify({
+            'success': True,
+            'data': [formatted_rates],
+            'metadata': {
+                'comparison_dates': {
+                    'today': today_data['date'],
+                    'yesterday': yesterday_data['date']
+                },
+                'requested_days': days,
+                'format': 'chat',
+                'description': 'Rate comparison with trend analysis and color coding for chatbot',
+                **(extra_metadata or {})
+            }
+        }), 200
+
 @app.route('/api/exchange_db2api', methods=['GET'])
 def db2api():
     """
     [수정됨] 데이터베이스 → API 환율 데이터 제공 기능.
-    루프 내 DB 조회를 제거하고 일괄 조회 방식으로 변경하여 성능을 개선합니다.
+    요청마다 DB를 조회하지 않고 메모리 환율 시계열에서 응답하며, 렌더링된 응답은 다음 동기화 전까지 캐시합니다.
+    최신 영업일 데이터가 없으면 백그라운드 동기화를 시작하고 보유한 최신 데이터를 stale로 표시해 응답합니다.
     """
     try:
         days_param = request.args.get('days')
@@ -391,127 +898,44 @@ def db2api():
         if not business_days:
             return jsonify({"error": "조회할 영업일 데이터가 없습니다"}), 404
         
-        # --- 1번 항목 수정: N+1 문제 해결 (web, chat 공통) ---
-        # 필요한 모든 날짜를 문자열 리스트로 변환
         date_strs_to_fetch = [d.strftime('%Y-%m-%d') for d in business_days]
-        
-        # 단 한 번의 요청으로 모든 날짜의 데이터를 가져옴
-        print(f"🔍 요청된 날짜들: {date_strs_to_fetch}")
-        all_data_result = postgrest_request(
-            'GET', EXCHANGE_RATES_TABLE, 
-            params={
-                'date': f'in.({",".join(date_strs_to_fetch)})',
-                'order': 'date.desc' # 최신순으로 정렬
-            }
-        )
-        
-        print(f"📊 조회된 데이터 개수: {len(all_data_result.get('data', []))}")
-        if all_data_result.get('data'):
-            available_dates = [item['date'] for item in all_data_result['data']]
-            print(f"📅 조회된 날짜들: {available_dates}")
-
-        # 3단계: 가장 최근 영업일 데이터 확인 (chat/web 공통)
-        latest_date_str = business_days[0].strftime('%Y-%m-%d')
-        latest_data_exists = False
-        
-        if all_data_result['success'] and all_data_result['data']:
-            available_dates = [item['date'] for item in all_data_result['data']]
-            latest_data_exists = latest_date_str in available_dates
-            print(f"✅ 최신 영업일({latest_date_str}) 데이터 존재: {latest_data_exists}")
-        
-        # 3-1단계: 최신 데이터가 없으면 api2db 실행
-        if not latest_data_exists:
-            print(f"❌ 최신 영업일({latest_date_str}) 데이터 없음. api2db 자동 실행 중...")
-            
-            api2db_result = sync_exchange_data_from_api()
-            if api2db_result['success']:
-                print("✅ api2db 실행 완료. 데이터 다시 조회 중...")
-                
-                # 데이터 다시 조회 (재귀 호출 대신 직접 조회)
-                all_data_result = postgrest_request(
-                    'GET', EXCHANGE_RATES_TABLE, 
-                    params={
-                        'date': f'in.({",".join(date_strs_to_fetch)})',
-                        'order': 'date.desc'
-                    }
-                )
-                print(f"🔄 재조회 결과: {len(all_data_result.get('data', []))}개")
-            else:
-                print(f"❌ api2db 실행 실패: {api2db_result.get('error', '알 수 없는 오류')}")
-                return jsonify({"error": f"api2db 실행 실패: {api2db_result.get('error', '알 수 없는 오류')}"}), 500
-        
-        # 최종 데이터 확인
-        if not all_data_result['success'] or not all_data_result['data']:
-            return jsonify({"error": "요청된 기간의 환율 데이터가 없습니다"}), 404
-        
-        db_data = all_data_result['data']
-        # --- 1번 항목 수정 끝 ---
-
-        if format_type == 'web':
-            # [수정됨] 이미 가져온 데이터(db_data)를 가공하기만 함
-            web_data = []
-            for row in db_data:
-                web_data.append({
-                    'date': row['date'],
-                    'USD': float(row.get('usd') or 0.0),
-                    'EUR': float(row.get('eur') or 0.0),
-                    'JPY100': float(row.get('jpy100') or 0.0),
-                    'CNH': float(row.get('cnh') or 0.0)
-                })
+        latest_date_str = date_strs_to_fetch[0]
 
-            return jsonify({
-                'success': True,
-                'data': web_data,
-                'metadata': {
-                    'total_days': len(web_data),
-                    'requested_days': days,
-                    'latest_date': web_data[0]['date'],
-                    'available_currencies': CURRENCIES,
-                    'format': 'web',
-                    'description': 'All rates are based on KRW. JPY100 means 100 yen.'
-                }
-            })
+        # 같은 (format, days, 기준 영업일) 응답은 다음 동기화 전까지 렌더링된 JSON을 그대로 반환
+        cache_key = (format_type, days, latest_date_str)
+        cached = rate_series.cached_response(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
+
+        # 가장 최근 영업일 데이터 확인 (메모리 시계열 기준)
+        rate_series.ensure_loaded()
+        latest_data_exists = latest_date_str in rate_series
         
-        elif format_type == 'chat':
-            # [수정됨] 이미 가져온 데이터(db_data)에서 최신 2일치 데이터를 사용
-            if len(db_data) < 2:
-                return jsonify({"error": "변화율 계산을 위해 최소 2일의 데이터가 필요합니다"}), 404
-                
-            today_data = db_data[0]
-            yesterday_data = db_data[1]
-            formatted_rates = {}
-            
-            for currency in CURRENCIES:
-                key = currency.lower() # DB 컬럼명은 소문자
-                today_rate = today_data.get(key)
-                yest_rate = yesterday_data.get(key)
-
-                if today_rate is not None and yest_rate is not None and yest_rate != 0:
-                    change_rate = ((today_rate - yest_rate) / yest_rate) * 100
-                    formatted_rates[currency] = round(today_rate, 2)
-                    # 변동율을 소수점 첫째자리까지만 표시
-                    formatted_rates[f"{currency}_trend"] = round(change_rate, 1)
-                    # 색상 정보 추가: 상승은 red, 하락은 blue
-                    if change_rate > 0:
-                        formatted_rates[f"{currency}_color"] = "Attention"
-                    elif change_rate < 0:
-                        formatted_rates[f"{currency}_color"] = "Accent"
-                    else:
-                        formatted_rates[f"{currency}_color"] = "Default"  # 변동 없음
+        if latest_data_exists:
+            db_data = rate_series.rows_for(date_strs_to_fetch)
+            extra_metadata = None
+        else:
+            # 최신 데이터가 없으면 요청 안에서 기다리지 않고 백그라운드 동기화(중복 실행 없음)만 시작하고,
+            # 보유한 가장 최근 데이터를 stale로 표시해 바로 응답
+            job, started = sync_jobs.start('db2api', min_interval=SYNC_RETRY_INTERVAL)
+            if started:
+                print(f"❌ 최신 영업일({latest_date_str}) 데이터 없음. 백그라운드 동기화 시작: {job['job_id']}")
+            db_data = rate_series.recent_rows(days)
+            extra_metadata = {'stale': True, 'expected_latest_date': latest_date_str,
+                              'sync_job': sync_job_summary(job)}
+            if not db_data:
+                return jsonify({"error": "환율 데이터가 아직 없습니다. 동기화 완료 후 다시 요청해주세요",
+                                "sync_job": sync_job_summary(job)}), 503, {'Retry-After': '10'}
 
-            return jsonify({
-                'success': True,
-                'data': [formatted_rates],
-                'metadata': {
-                    'comparison_dates': {
-                        'today': today_data['date'],
-                        'yesterday': yesterday_data['date']
-                    },
-                    'requested_days': days,
-                    'format': 'chat',
-                    'description': 'Rate comparison with trend analysis and color coding for chatbot'
-                }
-            })
+        # 최종 데이터 확인 (최신순)
+        if not db_data:
+            return jsonify({"error": "요청된 기간의 환율 데이터가 없습니다"}), 404
+
+        response, status_code = render_exchange_rates(format_type, days, db_data, extra_metadata)
+        # stale 응답은 동기화 후 다시 확인하도록 캐시하지 않음
+        if status_code == 200 and latest_data_exists:
+            rate_series.store_response(cache_key, response.get_data())
+        return response, status_code
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -555,6 +979,9 @@ def health_check():
                 'latest_data': latest_date,
                 'total_records': total_records
             },
+            'rate_series': rate_series.stats(),
+            'sync_job': sync_jobs.get(),
+            'business_calendar': business_calendar.stats(),
             'supported_currencies': CURRENCIES,
             'timestamp': datetime.now().isoformat()
         })
@@ -611,6 +1038,9 @@ if __name__ == '__main__':
     # 앱 종료 시 스케줄러도 종료
     atexit.register(lambda: scheduler.shutdown())
     
+    # 메모리 환율 시계열 적재 (실패하면 첫 요청 때 다시 시도)
+    rate_series.load()
+    
     print(f"🔄 Exchange API v2 starting on {host}:{port}")
     print(f"📊 PostgREST API: {POSTGREST_BASE_URL}")
     print(f"📋 Table: {EXCHANGE_RATES_TABLE}")
@@ -0,0 +1,269 @@
+"""
+Reservation API 서빙 모드 벤치마크
+
+PostgREST 대신 응답을 일정 시간(--latency-ms) 늦게 돌려주는 스텁 서버를 띄우고,
+reservation_service.py를 thread 모드(Flask 내장 서버)와 gevent 모드로 차례로 실행한 뒤
+동시 접속 50/200/1000개에서 /api/reservation_list 처리량과 지연 시간(p50/p95/p99)을 JSON으로 출력합니다.
+
+사용 예:
+   python benchmark_reservations.py
+   python benchmark_reservations.py --concurrency 50,200 --duration 5 --latency-ms 100
+   python benchmark_reservations.py --modes gevent --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+DEFAULT_CONCURRENCY = (50, 200, 1000)
+DEFAULT_MODES = ('thread', 'gevent')
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reservation_service.py')
+REQUEST_PATH = '/api/reservation_list?type=car&limit=20&count=none'
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors):
+    """지연 시간 목록(초) → 요약 통계 (ms)"""
+    values = sorted(latencies)
+    if not values:
+        return {'requests': 0, 'errors': errors, 'throughput_rps': 0.0}
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'p50_ms': round(percentile(values, 50) * 1000, 2),
+        'p95_ms': round(percentile(values, 95) * 1000, 2),
+        'p99_ms': round(percentile(values, 99) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2),
+        'throughput_rps': round(len(values) / elapsed, 1) if elapsed else None
+    }
+
+
+# --- PostgREST 스텁 (별도 프로세스) ---
+
+def stub_rows(count=20):
+    return [{
+        'id': i, 'type': 'car', 'target': i % 2 + 1, 'session': i % 4 + 1,
+        'emailaddress': f'user{i}@company.com', 'reason': '벤치마크',
+        'time': f'2025-06-{i % 28 + 1:02d}T09:00:00+09:00'
+    } for i in range(1, count + 1)]
+
+
+async def serve_stub(port, service_port, latency):
+    """지연 후 고정 응답을 돌려주는 HTTP/1.1 keep-alive 서버"""
+    configs = [{'key': 'host', 'value': '127.0.0.1'}, {'key': 'port', 'value': str(service_port)},
+               {'key': 'protocol', 'value': 'http'}]
+    bodies = {
+        'env_configs': json.dumps(configs).encode('utf-8'),
+        'reservation_table': json.dumps(stub_rows(), ensure_ascii=False).encode('utf-8'),
+    }
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+
+                path = request_line.split()[1].decode('latin-1')
+                table = path.split('?')[0].strip('/')
+                body = bodies.get(table, b'{}')
+                if table == 'reservation_table':
+                    await asyncio.sleep(latency)
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Range: 0-19/*\r\nContent-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+
+# --- 부하 생성 ---
+
+async def read_response(reader):
+    """HTTP 응답 하나 읽기 → (상태 코드, 연결 유지 여부)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('연결이 끊어졌습니다.')
+    status = int(status_line.split()[1])
+    length, keep_alive = 0, not status_line.startswith(b'HTTP/1.0')
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value == 'keep-alive' or (keep_alive and value != 'close')
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client_loop(port, deadline, latencies, counters):
+    """연결 하나로 deadline까지 요청 반복 (서버가 연결을 닫으면 다시 연결)"""
+    request = (f'GET {REQUEST_PATH} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n'
+               f'Connection: keep-alive\r\n\r\n').encode('latin-1')
+    writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                counters['errors'] += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            counters['errors'] += 1
+            if writer is not None:
+                writer.close()
+                writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(port, concurrency, duration):
+    latencies, counters = [], {'errors': 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client_loop(port, deadline, latencies, counters) for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, counters['errors'])
+
+
+# --- 서비스 실행 ---
+
+def wait_for_health(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_process(args, env=None):
+    return subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_process(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_mode(mode, args):
+    """서빙 모드 하나를 띄우고 동시 접속 수별로 측정"""
+    env = dict(os.environ, SERVE_MODE=mode, DEBUG='false',
+               POSTGREST_BASE_URL=f'http://127.0.0.1:{args.stub_port}')
+    service = start_process([sys.executable, SERVICE_PATH], env=env)
+    try:
+        if not wait_for_health(args.port):
+            return {'mode': mode, 'error': '서비스가 시작되지 않았습니다.'}
+        results = []
+        for concurrency in args.concurrency:
+            print(f"⏱️  {mode} 모드, 동시 접속 {concurrency}개 측정 중...", file=sys.stderr)
+            asyncio.run(run_load(args.port, min(concurrency, 50), 1))  # 워밍업
+            result = asyncio.run(run_load(args.port, concurrency, args.duration))
+            results.append({'concurrency': concurrency, **result})
+        return {'mode': mode, 'results': results}
+    finally:
+        stop_process(service)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reservation API 서빙 모드(thread/gevent) 벤치마크')
+    parser.add_argument('--modes', default=','.join(DEFAULT_MODES), help='측정할 서빙 모드 (기본: thread,gevent)')
+    parser.add_argument('--concurrency', default=','.join(str(c) for c in DEFAULT_CONCURRENCY),
+                        help='쉼표로 구분한 동시 접속 수 (기본: 50,200,1000)')
+    parser.add_argument('--duration', type=float, default=10, help='동시 접속 수별 측정 시간(초)')
+    parser.add_argument('--latency-ms', type=float, default=50, help='PostgREST 스텁 응답 지연(ms)')
+    parser.add_argument('--port', type=int, default=3907, help='벤치마크용 서비스 포트')
+    parser.add_argument('--stub-port', type=int, default=3908, help='PostgREST 스텁 포트')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본: 표준 출력)')
+    parser.add_argument('--serve-stub', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_stub:
+        asyncio.run(serve_stub(args.stub_port, args.port, args.latency_ms / 1000))
+        return
+
+    args.concurrency = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+
+    # 동시 접속 1000개 + 서비스 쪽 연결을 위해 파일 디스크립터 한도를 올림
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = max(soft, min(hard, max(args.concurrency) * 4 + 256))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    stub = start_process([sys.executable, os.path.abspath(__file__), '--serve-stub',
+                          '--stub-port', str(args.stub_port), '--port', str(args.port),
+                          '--latency-ms', str(args.latency_ms)])
+    try:
+        time.sleep(0.5)
+        results = [run_mode(mode, args) for mode in modes]
+    finally:
+        stop_process(stub)
+
+    report = {
+        'benchmark': 'reservation-api /api/reservation_list serve modes',
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+        'upstream_latency_ms': args.latency_ms,
+        'duration_seconds': args.duration,
+        'results': results
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+CalendarCache 무효화/저장 순서 테스트 (PostgREST 없이 실행)
+
+   python -m unittest test_calendar_cache
+"""
+
+import threading
+import unittest
+from datetime import date
+
+import reservation_service as rs
+
+
+class FakeResponse:
+    headers = {}
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.rows
+
+
+class CalendarCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [{'id': 1, 'type': 'car', 'target': 1, 'session': 1, 'time': '2025-06-02T09:00:00+09:00'}]
+        self.calls = 0
+        self.gate = None  # 설정되면 PostgREST 호출이 이 이벤트를 기다림
+        self.started = threading.Event()
+        self.client = rs.PostgRESTClient('http://127.0.0.1:9')
+        self.client.get = self.fake_get
+        self.saved = rs.postgrest, rs.calendar_cache
+        rs.postgrest = self.client
+        rs.calendar_cache = rs.CalendarCache()
+
+    def tearDown(self):
+        rs.postgrest, rs.calendar_cache = self.saved
+
+    def fake_get(self, path, **kwargs):
+        self.calls += 1
+        rows = [dict(row) for row in self.rows]
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return FakeResponse(rows)
+
+    def read(self):
+        return rs.cached_calendar_range('car', '2025-06-02T00:00:00', '2025-06-02T23:59:59')
+
+    def test_invalidated_bucket_is_cached_again_on_next_read(self):
+        self.read()
+        rs.calendar_cache.invalidate(rows=self.rows)
+        self.read()
+        self.read()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(rs.calendar_cache.stats()['buckets'], 1)
+        self.assertEqual(rs.calendar_cache.stats()['hits'], 1)
+
+    def test_result_of_fetch_started_before_invalidation_is_not_stored(self):
+        rs.calendar_cache.store('car', {date(2025, 6, 2): []}, rs.calendar_cache.current_epoch())
+        rs.calendar_cache.invalidate(rows=self.rows)
+        self.assertEqual(rs.calendar_cache.stats()['buckets'], 0)
+
+        # 무효화 전에 시작된 호출에 무효화 후 요청이 합류 → 그 결과는 저장하지 않아야 함
+        self.gate = threading.Event()
+        leader = threading.Thread(target=self.read)
+        leader.start()
+        self.assertTrue(self.started.wait(5))
+        rs.calendar_cache.invalidate(rows=self.rows)
+        follower = threading.Thread(target=self.read)
+        follower.start()
+        while rs.postgrest._flights.stats()['coalesced'] == 0:
+            threading.Event().wait(0.01)
+        self.gate.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(rs.calendar_cache.stats()['buckets'], 0)
+
+        # 다음 조회는 새로 가져와 저장
+        self.gate = None
+        self.read()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(rs.calendar_cache.stats()['buckets'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()